@@ -0,0 +1,217 @@
+import hashlib
+import math
+import random
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+from app.config import settings
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n|\n(?=[#*\-\d])")
+
+# Words that carry no topical signal for BM25 queries
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this "
+    "to was were what when where which who why will with about into than then these those".split()
+)
+
+# MinHash parameters: NUM_PERM = BANDS * ROWS hash functions, banded for LSH
+SHINGLE_SIZE = 3
+BANDS = 16
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)
+]
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count (about four characters per token for English)"""
+    return math.ceil(len(text) / 4)
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def chunk_text(text: str, chunk_words: int) -> List[str]:
+    """
+    Split text into passages of roughly `chunk_words` words.
+
+    Paragraphs are packed together up to the limit; paragraphs longer than the
+    limit are split on sentence boundaries.
+    """
+    chunks = []
+    current: List[str] = []
+    current_words = 0
+
+    def emit():
+        nonlocal current, current_words
+        if current:
+            chunks.append(" ".join(current))
+        current, current_words = [], 0
+
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        pieces = [paragraph] if len(paragraph.split()) <= chunk_words else _SENTENCE_RE.split(paragraph)
+
+        for piece in pieces:
+            words = len(piece.split())
+            if current and current_words + words > chunk_words:
+                emit()
+            current.append(piece)
+            current_words += words
+
+    emit()
+    return chunks
+
+
+def minhash(tokens: List[str]) -> List[int]:
+    """MinHash signature of the word shingles of a passage"""
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """
+    Locality-sensitive index over MinHash signatures.
+
+    Passages are compared only with passages sharing at least one band of
+    their signature, so checking a passage costs roughly constant time.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._buckets: Dict[tuple, List[List[int]]] = {}
+
+    def add_if_new(self, signature: List[int]) -> bool:
+        """Add a signature unless a near-duplicate is already indexed"""
+        bands = [(i, tuple(signature[i * ROWS:(i + 1) * ROWS])) for i in range(BANDS)]
+        for band in bands:
+            for other in self._buckets.get(band, ()):
+                if _similarity(signature, other) >= self.threshold:
+                    return False
+
+        for band in bands:
+            self._buckets.setdefault(band, []).append(signature)
+        return True
+
+
+def bm25_scores(query_tokens: List[str], documents: List[List[str]]) -> List[float]:
+    """Okapi BM25 score of each tokenized document for the query"""
+    if not documents:
+        return []
+
+    avg_length = sum(len(doc) for doc in documents) / len(documents) or 1.0
+    document_frequency = Counter()
+    for doc in documents:
+        document_frequency.update(set(doc))
+
+    terms = set(query_tokens)
+    idf = {
+        term: math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+        for term in terms
+    }
+
+    scores = []
+    for doc in documents:
+        counts = Counter(doc)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_length)
+        scores.append(sum(
+            idf[term] * counts[term] * (BM25_K1 + 1) / (counts[term] + norm)
+            for term in terms if counts[term]
+        ))
+    return scores
+
+
+def build_context(topic: str, scraped_content: List[dict], token_budget: Optional[int] = None) -> dict:
+    """
+    Assemble the writer's source context within a token budget.
+
+    Scraped sources are split into passages, near-duplicate passages (MinHash
+    over word shingles) are dropped, and the rest are ranked by BM25 against
+    the topic. The best passages are packed into the budget, at most
+    CONTEXT_MAX_CHUNKS_PER_SOURCE from any one source, and rendered per
+    source in their original order. Source numbering matches scraped_content.
+
+    Args:
+        topic: Research topic used as the ranking query
+        scraped_content: List of dicts with url, title, and content
+        token_budget: Override WRITER_CONTEXT_TOKEN_BUDGET
+
+    Returns:
+        Dictionary with context, tokens (estimated), sources_used, chunks_used,
+        chunks_total, and duplicates_dropped
+    """
+    token_budget = token_budget or settings.WRITER_CONTEXT_TOKEN_BUDGET
+
+    passages = []
+    for source_idx, source in enumerate(scraped_content):
+        for position, text in enumerate(chunk_text(source.get("content", ""), settings.CONTEXT_CHUNK_WORDS)):
+            passages.append({"source": source_idx, "position": position, "text": text, "tokens": tokenize(text)})
+
+    query = [token for token in tokenize(topic) if token not in STOPWORDS] or tokenize(topic)
+    for passage, score in zip(passages, bm25_scores(query, [p["tokens"] for p in passages])):
+        # Ties (and queries with no matches) favour passages nearer the top of a page
+        passage["score"] = score - passage["position"] * 1e-3
+
+    ranked = sorted(passages, key=lambda p: p["score"], reverse=True)
+
+    index = NearDuplicateIndex(settings.CONTEXT_DEDUPE_THRESHOLD)
+    headers = {
+        idx: f"\n--- Source {idx + 1}: {source.get('title', 'Untitled')} ---\nURL: {source.get('url', 'N/A')}\n"
+        for idx, source in enumerate(scraped_content)
+    }
+    selected: Dict[int, List[dict]] = {}
+    used_tokens = 0
+    duplicates = 0
+
+    for passage in ranked:
+        if len(selected.get(passage["source"], ())) >= settings.CONTEXT_MAX_CHUNKS_PER_SOURCE:
+            continue
+
+        cost = estimate_tokens(passage["text"]) + 1
+        if passage["source"] not in selected:
+            cost += estimate_tokens(headers[passage["source"]])
+        if used_tokens + cost > token_budget:
+            continue
+
+        # Checked last so budget-rejected passages do not shadow later duplicates
+        if not index.add_if_new(minhash(passage["tokens"])):
+            duplicates += 1
+            continue
+
+        selected.setdefault(passage["source"], []).append(passage)
+        used_tokens += cost
+
+    parts = []
+    for source_idx in sorted(selected):
+        chunks = sorted(selected[source_idx], key=lambda p: p["position"])
+        parts.append(headers[source_idx] + "\n".join(chunk["text"] for chunk in chunks) + "\n")
+
+    return {
+        "context": "\n".join(parts),
+        "tokens": used_tokens,
+        "sources_used": len(selected),
+        "chunks_used": sum(len(chunks) for chunks in selected.values()),
+        "chunks_total": len(passages),
+        "duplicates_dropped": duplicates,
+    }
@@ -0,0 +1,62 @@
+from app.config import settings
+from app.utils.logger import logger
+
+# Execution profile for each research depth.
+#   search_queries: queries searched concurrently ({topic} is substituted)
+#   max_results: search results requested per query
+#   scrape_urls: top results scraped
+#   scrape_concurrency: scrapes in flight during the researcher stage
+#   mode: "single" writes from the sources in one call; "map_reduce" first
+#       summarizes each source, then writes from the summaries
+#   context_tokens: token budget of the writer prompt's source context
+DEPTH_PROFILES = {
+    "quick": {
+        "search_queries": ["{topic}"],
+        "max_results": 5,
+        "scrape_urls": 3,
+        "scrape_concurrency": 3,
+        "mode": "single",
+        "context_tokens": 3000,
+    },
+    "medium": {
+        "search_queries": ["{topic}"],
+        "max_results": 8,
+        "scrape_urls": 5,
+        "scrape_concurrency": 5,
+        "mode": "single",
+        "context_tokens": 6000,
+    },
+    "deep": {
+        "search_queries": ["{topic}", "{topic} research analysis", "{topic} latest developments"],
+        "max_results": 15,
+        "scrape_urls": 30,
+        "scrape_concurrency": 10,
+        "mode": "map_reduce",
+        "context_tokens": 10000,
+    },
+}
+
+DEFAULT_DEPTH = "medium"
+
+
+def get_depth_profile(depth: str) -> dict:
+    """
+    Get the execution profile for a research depth.
+
+    Unknown depths run with the medium profile. The writer context budget of
+    the medium profile follows WRITER_CONTEXT_TOKEN_BUDGET.
+
+    Args:
+        depth: Requested research depth
+
+    Returns:
+        Profile dictionary (see DEPTH_PROFILES)
+    """
+    if depth not in DEPTH_PROFILES:
+        logger.warning(f"Unknown research depth '{depth}', using {DEFAULT_DEPTH}")
+        depth = DEFAULT_DEPTH
+
+    profile = dict(DEPTH_PROFILES[depth])
+    if depth == DEFAULT_DEPTH:
+        profile["context_tokens"] = settings.WRITER_CONTEXT_TOKEN_BUDGET
+    return profile
@@ -1,9 +1,19 @@
+import asyncio
 import uuid
 from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from app.agents.context import estimate_tokens
+from app.agents.quality import rewrite_targets, score_draft, section_issues
 from app.agents.state import AgentState
+from app.config import settings
 from app.tools.llm import call_llm
-from app.models.research import Report, ResearchSession
+from app.models.research import Report
+from app.utils.helpers import normalize_query
 from app.utils.logger import logger
+from app.utils.markdown import section_text, split_sections, strip_code_fence
+from app.utils.pubsub import broker
+from app.workflow.checkpoint import clear_checkpoint, reopen_checkpoint
+from app.workflow.progress import fail_session, tracker_for
 
 
 async def editor_node(state: AgentState) -> AgentState:
@@ -21,49 +31,50 @@ async def editor_node(state: AgentState) -> AgentState:
         draft_report = state["draft_report"]
         topic = state["topic"]
         
+        tracker = tracker_for(state)
+        
         logger.info(f"Editor node started for session {session_id}")
         
         # Update MongoDB session status to indicate editor is running
-        session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
-        if session:
-            session.status = "editor_running"
-            session.progress = 70
-            session.current_agent = "editor"
-            await session.save()
-        
-        # Count words in draft report
-        word_count = len(draft_report.split())
-        logger.info(f"Draft report word count: {word_count}")
-        
-        # Check quality - if too short and haven't retried too many times, request rewrite
-        if word_count < 500 and state["retry_count"] < 2:
-            logger.warning(f"Draft report too short ({word_count} words), requesting rewrite")
+        await tracker.update("editor_running", 70, "editor")
+        
+        # Score the draft locally (sections, citations, length, repetition)
+        score = score_draft(draft_report, state.get("scraped_content", []))
+        logger.info(
+            f"Draft report: {score['word_count']} words, "
+            f"{score['citation_coverage']:.0%} of sources cited, issues: {'; '.join(score['issues']) or 'none'}"
+        )
+        
+        # Retry only when a targeted rewrite can fix the problem
+        targets = [] if score["passed"] else rewrite_targets(score)
+        if targets and state["retry_count"] < settings.QUALITY_MAX_REWRITES:
+            logger.warning(f"Draft report needs work, requesting rewrite of: {', '.join(targets)}")
             
             # Increment retry count
             state["retry_count"] += 1
+            state["rewrite_plan"] = {
+                "sections": targets,
+                "issues": score["issues"],
+                "uncited_urls": score["uncited_urls"],
+            }
             state["current_step"] = "needs_rewrite"
+            await reopen_checkpoint(state, "writer")
             
             # Update session status
-            if session:
-                session.status = "writer_running"
-                session.progress = 50
-                session.current_agent = "editor"
-                await session.save()
+            await tracker.update("writer_running", 50, "editor")
             
             return state
         
-        # Quality passed - polish the report
+        # Quality passed - polish only the sections that need it
         logger.info("Draft report quality acceptable, polishing...")
         
-        # Create polish prompt
-        polish_prompt = f"""Review and polish this research report for clarity, grammar, and flow:
-
-{draft_report}
-
-Improve the structure, fix any grammatical errors, enhance readability, and ensure all sections flow logically. Maintain all citations and sources."""
-        
-        # Call LLM to polish the report
-        final_report = await call_llm(polish_prompt)
+        # Stream each section to subscribers as soon as it and those before it are done
+        broker.publish(session_id, "report_start")
+        final_report = await polish_sections(
+            topic,
+            split_sections(draft_report),
+            on_text=lambda text: broker.publish(session_id, "report", {"text": text})
+        )
         
         logger.info(f"Final report generated: {len(final_report)} characters")
         
@@ -81,19 +92,17 @@ Improve the structure, fix any grammatical errors, enhance readability, and ensu
             content=final_report,
             sources=sources,
             word_count=len(final_report.split()),
+            topic_key=normalize_query(topic),
+            depth=state.get("depth"),
             created_at=datetime.now(timezone.utc)
         )
         await report.insert()
         
         logger.info(f"Report saved to database with ID: {report_id}")
         
-        # Update ResearchSession to complete
-        if session:
-            session.status = "complete"
-            session.progress = 100
-            session.current_agent = "editor"
-            session.report_id = report_id
-            await session.save()
+        # Update ResearchSession to complete and end the event stream
+        await tracker.complete(report_id)
+        await clear_checkpoint(session_id)
         
         # Update state
         state["final_report"] = final_report
@@ -112,15 +121,96 @@ Improve the structure, fix any grammatical errors, enhance readability, and ensu
         state["current_step"] = "editor_failed"
         
         # Update MongoDB session status to failed
-        try:
-            session_id = state.get("session_id")
-            if session_id:
-                session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
-                if session:
-                    session.status = "failed"
-                    session.error_message = error_msg
-                    await session.save()
-        except Exception as db_error:
-            logger.error(f"Failed to update session status in DB: {db_error}")
-        
-        return state
\ No newline at end of file
+        await fail_session(state, error_msg)
+        
+        return state
+
+
+async def polish_sections(
+    topic: str,
+    sections: List[dict],
+    on_text: Optional[Callable[[str], None]] = None,
+    concurrency: Optional[int] = None,
+) -> str:
+    """
+    Polish the sections of a report concurrently and reassemble it.
+    
+    Sections that pass the local checks in app.agents.quality are kept as
+    they are; the rest are rewritten one LLM call each, sized to the section,
+    so a long report is never cut off by a single call's max_tokens.
+    
+    Args:
+        topic: Research topic
+        sections: Sections from app.utils.markdown.split_sections
+        on_text: Optional callback receiving the report text in document order
+        concurrency: Maximum sections in flight (default: EDITOR_SECTION_CONCURRENCY)
+        
+    Returns:
+        The polished report
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.EDITOR_SECTION_CONCURRENCY)
+    texts: List[Optional[str]] = [None] * len(sections)
+    emitted = 0
+    polished = 0
+    
+    def release():
+        nonlocal emitted
+        while emitted < len(texts) and texts[emitted] is not None:
+            if on_text is not None:
+                on_text(("\n\n" if emitted else "") + texts[emitted])
+            emitted += 1
+    
+    async def edit(idx: int, section: dict):
+        nonlocal polished
+        issues = section_issues(section, sections[idx + 1] if idx + 1 < len(sections) else None)
+        if issues:
+            async with semaphore:
+                texts[idx] = await _polish_section(topic, section, issues)
+            polished += 1
+        else:
+            texts[idx] = section_text(section)
+        release()
+    
+    await asyncio.gather(*(edit(idx, section) for idx, section in enumerate(sections)))
+    
+    logger.info(f"Polished {polished} of {len(sections)} sections, {len(sections) - polished} passed as-is")
+    return "\n\n".join(texts)
+
+
+async def _polish_section(topic: str, section: dict, issues: List[str]) -> str:
+    original = section_text(section)
+    issue_list = "\n".join(f"- {issue}" for issue in issues)
+    prompt = f"""You are editing one section of a research report on '{topic}'.
+
+Fix these problems:
+{issue_list}
+
+Also correct grammar and improve clarity and flow. Keep every fact, figure, citation and URL.
+Do not add new sections. Return only the revised section in markdown{", starting with the same heading line" if section["heading"] else ""}.
+
+{original}"""
+    
+    max_tokens = min(settings.EDITOR_SECTION_MAX_TOKENS, max(256, estimate_tokens(original) * 2))
+    try:
+        revised = strip_code_fence(await call_llm(prompt, max_tokens=max_tokens, temperature=0.0, cache=True))
+    except Exception as e:
+        logger.warning(f"Failed to polish section '{section['title']}', keeping draft: {e}")
+        return original
+    
+    if section["heading"]:
+        # Keep the draft's heading so the report outline cannot drift
+        revised_sections = split_sections(revised, max_level=6)
+        if revised_sections and revised_sections[0]["heading"]:
+            revised = "\n\n".join(
+                [section["heading"], revised_sections[0]["body"]]
+                + [section_text(extra) for extra in revised_sections[1:]]
+            ).strip()
+        else:
+            revised = f"{section['heading']}\n\n{revised}"
+    
+    # A much shorter rewrite was cut off or dropped content
+    if len(revised.split()) < 0.6 * len(original.split()):
+        logger.warning(f"Polished section '{section['title']}' lost too much text, keeping draft")
+        return original
+    
+    return revised
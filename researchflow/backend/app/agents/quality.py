@@ -0,0 +1,231 @@
+import re
+from collections import Counter
+from typing import List, Optional
+from urllib.parse import urlsplit
+from app.config import settings
+from app.utils.helpers import normalize_url
+from app.utils.markdown import split_sections
+
+_DOUBLED_WORD_RE = re.compile(r"\b(\w{2,})\s+\1\b", re.IGNORECASE)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_PLACEHOLDER_RE = re.compile(r"\[(insert|citation|source|todo)[^\]]*\]|\bTODO\b|lorem ipsum", re.IGNORECASE)
+_STRUCTURAL_LINE_RE = re.compile(r"^\s*([-*+]\s|\d+[.)]\s|\||>|#|```|~~~)")
+_TERMINAL_CHARS = ".!?:)\"'*_`]"
+
+_URL_RE = re.compile(r"https?://[^\s)\]>\"'`]+")
+_WORD_RE = re.compile(r"\w+")
+_HEADING_NUMBER_RE = re.compile(r"^(\d+(\.\d+)*[.)]?|[ivxlc]+[.)])\s+")
+
+# A sentence longer than this usually reads as a run-on
+MAX_SENTENCE_WORDS = 45
+
+# Sections the writer prompt asks for, in report order
+REQUIRED_SECTIONS = ["Introduction", "Key Findings", "Detailed Analysis", "Conclusion"]
+
+# Word n-gram size used to measure repetition across the report
+REPETITION_NGRAM = 5
+
+# Process-wide counters of draft scoring and rewrite cost
+quality_stats = {
+    "drafts_scored": 0,
+    "drafts_failed": 0,
+    "rewrites": 0,
+    "rewrite_seconds": 0.0,
+    "rewrite_prompt_tokens": 0,
+    "rewrite_completion_tokens": 0,
+}
+
+
+def _prose_sentences(body: str) -> List[str]:
+    prose = " ".join(
+        line.strip() for line in body.splitlines()
+        if line.strip() and not _STRUCTURAL_LINE_RE.match(line)
+    )
+    return [sentence for sentence in _SENTENCE_SPLIT_RE.split(prose) if sentence]
+
+
+def section_issues(section: dict, next_section: Optional[dict] = None) -> List[str]:
+    """
+    Run cheap local checks on one report section.
+
+    A heading with no text of its own is expected for the report title
+    (level 1) and for a heading directly followed by a subsection, so those
+    are not flagged.
+
+    Args:
+        section: Section dict from app.utils.markdown.split_sections
+        next_section: The section that follows it, if any
+
+    Returns:
+        Human-readable issues; an empty list means the section needs no edit
+    """
+    body = section["body"]
+    issues = []
+
+    if not body.strip():
+        if not section["heading"] or section["level"] == 1:
+            return issues
+        if next_section is not None and next_section["level"] > section["level"]:
+            return issues
+        return ["the section has a heading but no text"]
+
+    doubled = _DOUBLED_WORD_RE.search(body)
+    if doubled:
+        issues.append(f"repeated word \"{doubled.group(0)}\"")
+
+    sentences = _prose_sentences(body)
+    long_sentences = [s for s in sentences if len(s.split()) > MAX_SENTENCE_WORDS]
+    if long_sentences:
+        issues.append(f"{len(long_sentences)} run-on sentence(s) longer than {MAX_SENTENCE_WORDS} words")
+
+    repeated = [s for s, n in Counter(s.lower() for s in sentences if len(s.split()) > 4).items() if n > 1]
+    if repeated:
+        issues.append(f"{len(repeated)} sentence(s) repeated verbatim")
+
+    if body.count("**") % 2:
+        issues.append("unbalanced bold markers")
+
+    if _PLACEHOLDER_RE.search(body):
+        issues.append("leftover placeholder text")
+
+    last_line = body.rstrip().splitlines()[-1].strip()
+    if not _STRUCTURAL_LINE_RE.match(last_line) and last_line[-1] not in _TERMINAL_CHARS:
+        issues.append("the last sentence is unfinished")
+
+    return issues
+
+
+def _heading_key(title: str) -> str:
+    """Heading title without case, emphasis, numbering or a trailing colon"""
+    key = " ".join(title.replace("*", "").replace("_", " ").lower().split())
+    return _HEADING_NUMBER_RE.sub("", key).rstrip(":").strip()
+
+
+def find_section(sections: List[dict], title: str) -> Optional[dict]:
+    """
+    Find a report section (level 2 or deeper) by title.
+
+    Numbering, emphasis and case are ignored ("2. **Key Findings**"), but the
+    title must otherwise match, so the report title "# Introduction to Rust"
+    is not taken for the Introduction.
+    """
+    key = _heading_key(title)
+    for section in sections:
+        if section["level"] >= 2 and _heading_key(section["title"]) == key:
+            return section
+    return None
+
+
+def _cited(url: str, cited_urls: set, cited_hosts: set) -> bool:
+    # Models often cite the site rather than the exact page
+    return normalize_url(url) in cited_urls or (urlsplit(url).hostname or "").lower() in cited_hosts
+
+
+def repetition_ratio(text: str) -> float:
+    """Share of word n-grams that repeat an earlier n-gram"""
+    words = [word.lower() for word in _WORD_RE.findall(text)]
+    ngrams = [tuple(words[i:i + REPETITION_NGRAM]) for i in range(len(words) - REPETITION_NGRAM + 1)]
+    if not ngrams:
+        return 0.0
+    return 1 - len(set(ngrams)) / len(ngrams)
+
+
+def score_draft(draft: str, sources: List[dict]) -> dict:
+    """
+    Score a draft report with local checks only (no LLM call).
+
+    Checks that every section in REQUIRED_SECTIONS is present and at least
+    QUALITY_MIN_SECTION_WORDS long, the overall length against
+    QUALITY_MIN_WORDS, the share of scraped source URLs cited (by page or
+    host) against QUALITY_MIN_CITATION_COVERAGE, and word 5-gram repetition
+    against QUALITY_MAX_REPETITION.
+
+    Args:
+        draft: Draft report markdown
+        sources: Scraped sources with url
+
+    Returns:
+        Dictionary with passed, issues, word_count, missing_sections,
+        short_sections, citation_coverage, uncited_urls, and repetition
+    """
+    sections = split_sections(draft)
+    found = {title: find_section(sections, title) for title in REQUIRED_SECTIONS}
+
+    missing_sections = [title for title, section in found.items() if section is None]
+    short_sections = [
+        title for title, section in found.items()
+        if section is not None and len(section["body"].split()) < settings.QUALITY_MIN_SECTION_WORDS
+    ]
+
+    cited = _URL_RE.findall(draft)
+    cited_urls = {normalize_url(url.rstrip(".,;:")) for url in cited}
+    cited_hosts = {(urlsplit(url).hostname or "").lower() for url in cited}
+    source_urls = [source["url"] for source in sources if source.get("url")]
+    uncited_urls = [url for url in source_urls if not _cited(url, cited_urls, cited_hosts)]
+    coverage = 1 - len(uncited_urls) / len(source_urls) if source_urls else 1.0
+
+    word_count = len(draft.split())
+    repetition = repetition_ratio(draft)
+
+    issues = []
+    if word_count < settings.QUALITY_MIN_WORDS:
+        issues.append(f"too short ({word_count} words)")
+    if missing_sections:
+        issues.append(f"missing sections: {', '.join(missing_sections)}")
+    if short_sections:
+        issues.append(f"thin sections: {', '.join(short_sections)}")
+    if coverage < settings.QUALITY_MIN_CITATION_COVERAGE:
+        issues.append(f"cites {len(source_urls) - len(uncited_urls)} of {len(source_urls)} sources")
+    if repetition > settings.QUALITY_MAX_REPETITION:
+        issues.append(f"repetitive ({repetition:.0%} repeated phrases)")
+
+    quality_stats["drafts_scored"] += 1
+    if issues:
+        quality_stats["drafts_failed"] += 1
+
+    return {
+        "passed": not issues,
+        "issues": issues,
+        "word_count": word_count,
+        "missing_sections": missing_sections,
+        "short_sections": short_sections,
+        "citation_coverage": coverage,
+        "uncited_urls": uncited_urls,
+        "repetition": repetition,
+    }
+
+
+def rewrite_targets(score: dict) -> List[str]:
+    """
+    Sections a targeted rewrite should (re)write for a failing draft.
+
+    Repetition alone is left to the section editor. Low citation coverage
+    or a short draft with all sections present expands Detailed Analysis.
+
+    Returns:
+        Section titles in report order; empty if a rewrite would not help
+    """
+    targets = set(score["missing_sections"]) | set(score["short_sections"])
+    if not targets and (
+        score["word_count"] < settings.QUALITY_MIN_WORDS
+        or score["citation_coverage"] < settings.QUALITY_MIN_CITATION_COVERAGE
+    ):
+        targets.add("Detailed Analysis")
+    return [title for title in REQUIRED_SECTIONS if title in targets]
+
+
+def record_rewrite(seconds: float, prompt_tokens: int, completion_tokens: int):
+    """Count one targeted rewrite and its cost"""
+    quality_stats["rewrites"] += 1
+    quality_stats["rewrite_seconds"] += seconds
+    quality_stats["rewrite_prompt_tokens"] += prompt_tokens
+    quality_stats["rewrite_completion_tokens"] += completion_tokens
+
+
+def get_quality_stats() -> dict:
+    """Draft pass rate and rewrite frequency and cost for this process"""
+    stats = dict(quality_stats)
+    scored = stats["drafts_scored"]
+    stats["rewrite_rate"] = stats["rewrites"] / scored if scored else 0.0
+    stats["mean_rewrite_seconds"] = stats["rewrite_seconds"] / stats["rewrites"] if stats["rewrites"] else 0.0
+    return stats
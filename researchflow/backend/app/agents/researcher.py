@@ -1,9 +1,12 @@
+import asyncio
 from typing import List
+from app.agents.depth import get_depth_profile
 from app.agents.state import AgentState
-from app.tools.web_search import search_web
-from app.tools.scraper import scrape_url
-from app.models.research import ResearchSession
+from app.tools.web_search import merge_results, search_web
+from app.tools.scraper import scrape_urls
 from app.utils.logger import logger
+from app.workflow.checkpoint import save_checkpoint
+from app.workflow.progress import fail_session, tracker_for
 
 
 async def researcher_node(state: AgentState) -> AgentState:
@@ -20,49 +23,51 @@ async def researcher_node(state: AgentState) -> AgentState:
         session_id = state["session_id"]
         topic = state["topic"]
         
+        tracker = tracker_for(state)
+        
         logger.info(f"Researcher node started for session {session_id}, topic: {topic}")
         
+        # Reuse checkpointed search and scrape results when resuming
+        if "researcher" in state.get("completed_nodes", []):
+            logger.info(f"Researcher output restored from checkpoint for session {session_id}")
+            await tracker.update("researcher_complete", 33, "researcher")
+            state["current_step"] = "researcher_complete"
+            return state
+        
         # Update MongoDB session status to indicate researcher is running
-        session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
-        if session:
-            session.status = "researcher_running"
-            session.progress = 10
-            session.current_agent = "researcher"
-            await session.save()
+        await tracker.update("researcher_running", 10, "researcher")
+        
+        profile = get_depth_profile(state.get("depth", "medium"))
         
         # Search the web for the topic
         logger.info(f"Searching web for: {topic}")
-        search_results = await search_web(topic, max_results=8)
+        search_results = await _search_profile(topic, profile)
         
         if not search_results:
             logger.warning(f"No search results found for topic: {topic}")
             state["search_results"] = []
             state["scraped_content"] = []
             state["current_step"] = "researcher_complete"
+            await save_checkpoint(state, "researcher")
             return state
         
         logger.info(f"Found {len(search_results)} search results")
         
-        # Get top 5 URLs to scrape
-        urls = [r["url"] for r in search_results[:5]]
+        # Get the top URLs to scrape for this depth
+        top_results = search_results[:profile["scrape_urls"]]
+        urls = [r["url"] for r in top_results]
         logger.info(f"Scraping {len(urls)} URLs")
         
-        # Scrape each URL concurrently
-        scraped = []
-        for url in urls:
-            result = await scrape_url(url)
-            scraped.append(result)
+        # Scrape each URL concurrently, falling back to snippets past the deadline
+        snippets = {r["url"]: r for r in top_results}
+        scraped = await scrape_urls(urls, snippets=snippets, concurrency=profile["scrape_concurrency"])
         
         # Filter successful scrapes
         scraped_content = [s for s in scraped if s.get("success")]
         logger.info(f"Successfully scraped {len(scraped_content)} out of {len(urls)} URLs")
         
         # Update MongoDB session with progress
-        if session:
-            session.status = "researcher_complete"
-            session.progress = 33
-            session.current_agent = "researcher"
-            await session.save()
+        await tracker.update("researcher_complete", 33, "researcher")
         
         # Update state
         state["search_results"] = search_results
@@ -70,6 +75,8 @@ async def researcher_node(state: AgentState) -> AgentState:
         state["current_step"] = "researcher_complete"
         state["error"] = None
         
+        await save_checkpoint(state, "researcher")
+        
         logger.info(f"Researcher node completed for session {session_id}")
         return state
         
@@ -82,15 +89,15 @@ async def researcher_node(state: AgentState) -> AgentState:
         state["current_step"] = "researcher_failed"
         
         # Update MongoDB session status to failed
-        try:
-            session_id = state.get("session_id")
-            if session_id:
-                session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
-                if session:
-                    session.status = "failed"
-                    session.error_message = error_msg
-                    await session.save()
-        except Exception as db_error:
-            logger.error(f"Failed to update session status in DB: {db_error}")
-        
-        return state
\ No newline at end of file
+        await fail_session(state, error_msg)
+        
+        return state
+
+
+async def _search_profile(topic: str, profile: dict) -> List[dict]:
+    """Run the profile's search queries concurrently and merge their results"""
+    queries = [query.format(topic=topic) for query in profile["search_queries"]]
+    result_lists = await asyncio.gather(
+        *(search_web(query, max_results=profile["max_results"]) for query in queries)
+    )
+    return merge_results(list(result_lists), profile["max_results"] * len(queries))
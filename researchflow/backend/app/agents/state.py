@@ -1,4 +1,4 @@
-from typing import TypedDict, List, Optional
+from typing import TypedDict, List, Optional, Any
 
 
 class AgentState(TypedDict):
@@ -16,4 +16,11 @@ class AgentState(TypedDict):
     sources: List[dict]
     current_step: str
     retry_count: int
-    error: Optional[str]
\ No newline at end of file
+    error: Optional[str]
+    completed_nodes: List[str]  # nodes whose output was restored from a checkpoint
+    writer_context: Optional[str]  # source context of the last writer prompt
+    rewrite_plan: Optional[dict]  # sections the editor asked the writer to (re)write
+    rewrites: List[dict]  # cost of each targeted rewrite
+    tracker: Any  # SessionProgress carried through the workflow
+    deadline: float  # time.monotonic() by which the session must finish
+    runnable_since: float  # time.monotonic() when the next node became runnable
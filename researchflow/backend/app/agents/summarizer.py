@@ -0,0 +1,84 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+from app.config import settings
+from app.tools.llm import call_llm
+from app.utils.logger import logger
+
+
+async def summarize_source(topic: str, source: dict) -> dict:
+    """
+    Summarize one scraped source with respect to the research topic.
+
+    Args:
+        topic: Research topic
+        source: Scraped source dict with url, title, and content
+
+    Returns:
+        Copy of the source whose content is the summary, marked with
+        `summarized` (False if the LLM call failed and the original text
+        was kept)
+    """
+    prompt = f"""Summarize the following source for a research report on '{topic}'.
+
+Keep concrete facts, figures, dates, names and conclusions relevant to the topic.
+Leave out navigation text, advertising and anything unrelated to the topic.
+Write at most {settings.DEEP_SUMMARY_WORDS} words as plain sentences.
+
+Source: {source.get('title', 'Untitled')}
+URL: {source.get('url', 'N/A')}
+
+{source.get('content', '')}"""
+
+    try:
+        summary = await call_llm(
+            prompt,
+            max_tokens=settings.DEEP_SUMMARY_MAX_TOKENS,
+            temperature=settings.DEEP_SUMMARY_TEMPERATURE,
+            cache=True,
+        )
+        return {**source, "content": summary.strip(), "summarized": True}
+    except Exception as e:
+        logger.warning(f"Failed to summarize {source.get('url')}: {e}")
+        return {**source, "summarized": False}
+
+
+async def summarize_sources(
+    topic: str,
+    sources: List[dict],
+    concurrency: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+) -> List[dict]:
+    """
+    Map phase of deep research: summarize every source concurrently.
+
+    At most `concurrency` summaries are in flight for this session (the LLM
+    client's process-wide limit still applies on top). A source whose summary
+    fails keeps its scraped text, which the context builder then trims.
+
+    Args:
+        topic: Research topic
+        sources: Scraped sources
+        concurrency: Maximum summaries in flight (default: DEEP_MAP_CONCURRENCY)
+        on_progress: Optional coroutine called with (done, total) after each summary
+
+    Returns:
+        Summarized sources in the same order as sources
+    """
+    concurrency = concurrency or settings.DEEP_MAP_CONCURRENCY
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def summarize(source: dict) -> dict:
+        nonlocal done
+        async with semaphore:
+            summary = await summarize_source(topic, source)
+        done += 1
+        if on_progress is not None:
+            await on_progress(done, len(sources))
+        return summary
+
+    summaries = await asyncio.gather(*(summarize(source) for source in sources))
+
+    summarized = sum(1 for summary in summaries if summary["summarized"])
+    logger.info(f"Summarized {summarized}/{len(sources)} sources (concurrency={concurrency})")
+    return list(summaries)
@@ -1,7 +1,17 @@
+import time
+from typing import List
+from app.agents.context import build_context, estimate_tokens
+from app.agents.depth import get_depth_profile
+from app.agents.quality import REQUIRED_SECTIONS, find_section, record_rewrite
 from app.agents.state import AgentState
+from app.agents.summarizer import summarize_sources
+from app.config import settings
 from app.tools.llm import call_llm
-from app.models.research import ResearchSession
 from app.utils.logger import logger
+from app.utils.markdown import join_sections, split_sections, strip_code_fence
+from app.utils.pubsub import broker
+from app.workflow.checkpoint import save_checkpoint
+from app.workflow.progress import fail_session, tracker_for
 
 
 async def writer_node(state: AgentState) -> AgentState:
@@ -17,36 +27,31 @@ async def writer_node(state: AgentState) -> AgentState:
     try:
         session_id = state["session_id"]
         topic = state["topic"]
-        scraped_content = state["scraped_content"]
+        
+        tracker = tracker_for(state)
         
         logger.info(f"Writer node started for session {session_id}, topic: {topic}")
         
+        # Reuse the checkpointed draft when resuming
+        if "writer" in state.get("completed_nodes", []):
+            logger.info(f"Draft report restored from checkpoint for session {session_id}")
+            await tracker.update("writer_complete", 66, "writer")
+            state["current_step"] = "writer_complete"
+            return state
+        
         # Update MongoDB session status to indicate writer is running
-        session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
-        if session:
-            session.status = "writer_running"
-            session.progress = 40
-            session.current_agent = "writer"
-            await session.save()
-        
-        # Build context string from scraped content
-        if not scraped_content:
-            logger.warning(f"No scraped content available for topic: {topic}")
-            context = "No content available."
+        await tracker.update("writer_running", 40, "writer")
+        
+        plan = state.get("rewrite_plan")
+        if plan and state.get("draft_report") and state.get("writer_context"):
+            # Targeted rewrite: reuse the context and write only the flagged sections
+            response = await _rewrite_sections(state, plan)
         else:
-            context_parts = []
-            for idx, content in enumerate(scraped_content, 1):
-                source_text = f"\n--- Source {idx}: {content.get('title', 'Untitled')} ---\n"
-                source_text += f"URL: {content.get('url', 'N/A')}\n"
-                source_text += f"{content.get('content', '')}\n"
-                context_parts.append(source_text)
+            context = await _build_writer_context(state, tracker)
+            state["writer_context"] = context
             
-            context = "\n".join(context_parts)
-        
-        logger.info(f"Built context from {len(scraped_content)} sources, {len(context)} characters")
-        
-        # Create prompt for LLM
-        prompt = f"""You are a research analyst. Write a comprehensive research report on '{topic}'. Use the following sources:
+            # Create prompt for LLM
+            prompt = f"""You are a research analyst. Write a comprehensive research report on '{topic}'. Use the following sources:
 
 {context}
 
@@ -64,26 +69,29 @@ Format the report in markdown with:
 ## Conclusion
 
 Cite sources naturally in text using the source URLs provided."""
-        
-        logger.info("Calling LLM to generate draft report")
-        
-        # Call LLM to generate draft report
-        response = await call_llm(prompt)
+            
+            logger.info("Calling LLM to generate draft report")
+            
+            # Call LLM to generate draft report, streaming tokens to subscribers
+            broker.publish(session_id, "draft_start", {"retry_count": state["retry_count"]})
+            response = await call_llm(
+                prompt,
+                on_token=lambda text: broker.publish(session_id, "draft", {"text": text}),
+            )
         
         logger.info(f"Draft report generated: {len(response)} characters")
         
         # Update MongoDB session with progress
-        if session:
-            session.status = "writer_complete"
-            session.progress = 66
-            session.current_agent = "writer"
-            await session.save()
+        await tracker.update("writer_complete", 66, "writer", rewrites=state.get("rewrites", []))
         
         # Update state
         state["draft_report"] = response
+        state["rewrite_plan"] = None
         state["current_step"] = "writer_complete"
         state["error"] = None
         
+        await save_checkpoint(state, "writer")
+        
         logger.info(f"Writer node completed for session {session_id}")
         return state
         
@@ -96,15 +104,120 @@ Cite sources naturally in text using the source URLs provided."""
         state["current_step"] = "writer_failed"
         
         # Update MongoDB session status to failed
-        try:
-            session_id = state.get("session_id")
-            if session_id:
-                session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
-                if session:
-                    session.status = "failed"
-                    session.error_message = error_msg
-                    await session.save()
-        except Exception as db_error:
-            logger.error(f"Failed to update session status in DB: {db_error}")
-        
-        return state
\ No newline at end of file
+        await fail_session(state, error_msg)
+        
+        return state
+
+
+async def _build_writer_context(state: AgentState, tracker) -> str:
+    """Pack the most relevant, deduplicated source passages into the token budget"""
+    topic = state["topic"]
+    scraped_content = state["scraped_content"]
+    profile = get_depth_profile(state.get("depth", "medium"))
+    
+    if not scraped_content:
+        logger.warning(f"No scraped content available for topic: {topic}")
+        return "No content available."
+    
+    sources = scraped_content
+    if profile["mode"] == "map_reduce":
+        # Map: summarize each source concurrently; reduce: write from the summaries
+        async def on_progress(done: int, total: int):
+            await tracker.update("writer_running", 40 + (15 * done) // total, "writer")
+        
+        sources = await summarize_sources(topic, scraped_content, on_progress=on_progress)
+    
+    built = build_context(topic, sources, token_budget=profile["context_tokens"])
+    logger.info(
+        f"Built context from {built['sources_used']}/{len(sources)} sources: "
+        f"{built['chunks_used']}/{built['chunks_total']} passages, "
+        f"{built['duplicates_dropped']} duplicates dropped, ~{built['tokens']} tokens"
+    )
+    return built["context"] or "No content available."
+
+
+async def _rewrite_sections(state: AgentState, plan: dict) -> str:
+    """
+    Write only the sections the editor flagged and merge them into the draft.
+    
+    Returns:
+        The merged draft report
+    """
+    session_id = state["session_id"]
+    topic = state["topic"]
+    draft = state["draft_report"]
+    sections = plan["sections"]
+    
+    uncited = ""
+    if plan.get("uncited_urls"):
+        urls = "\n".join(f"- {url}" for url in plan["uncited_urls"])
+        uncited = f"\nThe draft does not cite these sources yet; use and cite them where relevant:\n{urls}\n"
+    
+    prompt = f"""You are a research analyst improving a draft research report on '{topic}'. Use the following sources:
+
+{state["writer_context"]}
+
+Current draft:
+
+{draft}
+
+The draft was flagged for: {"; ".join(plan["issues"])}.
+{uncited}
+Write ONLY these sections, in this order, each starting with a "## " heading: {", ".join(sections)}.
+Make each section substantial (at least {settings.QUALITY_MIN_SECTION_WORDS * 3} words) and grounded in the sources.
+Do not repeat the other sections of the draft. Cite sources naturally in text using the source URLs provided."""
+    
+    logger.info(f"Calling LLM to rewrite sections: {', '.join(sections)}")
+    
+    broker.publish(session_id, "draft_start", {"retry_count": state["retry_count"], "sections": sections})
+    start = time.perf_counter()
+    response = await call_llm(
+        prompt,
+        on_token=lambda text: broker.publish(session_id, "draft", {"text": text})
+    )
+    elapsed = time.perf_counter() - start
+    
+    prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(response)
+    record_rewrite(elapsed, prompt_tokens, completion_tokens)
+    state["rewrites"] = state.get("rewrites", []) + [{
+        "retry": state["retry_count"],
+        "sections": sections,
+        "issues": plan["issues"],
+        "seconds": round(elapsed, 3),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+    }]
+    logger.info(f"Rewrite {state['retry_count']} took {elapsed:.1f}s, ~{prompt_tokens + completion_tokens} tokens")
+    
+    return merge_sections(draft, strip_code_fence(response), sections)
+
+
+def merge_sections(draft: str, rewritten: str, titles: List[str]) -> str:
+    """
+    Merge rewritten sections into a draft.
+    
+    A rewritten section replaces the draft's section of the same title; a
+    section the draft lacks is inserted before the next required section
+    that follows it in REQUIRED_SECTIONS, or appended.
+    """
+    sections = split_sections(draft)
+    new_sections = split_sections(rewritten)
+    
+    for title in titles:
+        new = find_section(new_sections, title)
+        if new is None:
+            logger.warning(f"Rewrite did not include section: {title}")
+            continue
+        
+        existing = find_section(sections, title)
+        if existing is not None:
+            existing["body"] = new["body"]
+            continue
+        
+        later = [find_section(sections, t) for t in REQUIRED_SECTIONS[REQUIRED_SECTIONS.index(title) + 1:]]
+        later = [section for section in later if section is not None]
+        heading = {**new, "heading": f"## {title}", "title": title, "level": 2}
+        position = sections.index(later[0]) if later else len(sections)
+        sections.insert(position, heading)
+    
+    return join_sections(sections)
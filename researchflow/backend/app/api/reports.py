@@ -1,11 +1,137 @@
 # API endpoints for fetching reports
-from fastapi import APIRouter, HTTPException
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from app.config import settings
 from app.models.research import Report
-from app.schemas.research import ReportResponse
+from app.schemas.research import ReportListResponse, ReportResponse, ReportSummary
 from app.utils.logger import logger
 
 router = APIRouter(prefix="/api", tags=["reports"])
 
+# Fields a listing may return; content and sources are never loaded for lists
+SUMMARY_FIELDS = ("report_id", "created_at", "session_id", "topic", "depth", "word_count")
+# Needed to build the next cursor, so always returned
+CURSOR_FIELDS = ("report_id", "created_at")
+
+
+def encode_cursor(created_at: datetime, report_id: str) -> str:
+    """Encode the position after a report as an opaque cursor"""
+    payload = json.dumps({"created_at": created_at.isoformat(), "report_id": report_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Turn a cursor back into a filter matching the reports after it.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at = datetime.fromisoformat(payload["created_at"])
+        report_id = str(payload["report_id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    # Newest first, ties on created_at broken by report_id
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "report_id": {"$lt": report_id}},
+        ]
+    }
+
+
+def _projection(fields: Optional[str]) -> dict:
+    """
+    Build the Mongo projection for a comma-separated field list.
+
+    Raises:
+        ValueError: If a field is not a summary field
+    """
+    if not fields:
+        selected = SUMMARY_FIELDS
+    else:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected if field not in SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(SUMMARY_FIELDS)})"
+            )
+    projection = {field: 1 for field in (*CURSOR_FIELDS, *selected)}
+    projection["_id"] = 0
+    return projection
+
+
+@router.get("/reports", response_model=ReportListResponse, response_model_exclude_unset=True)
+async def list_reports(
+    limit: int = Query(settings.REPORT_LIST_DEFAULT_LIMIT, ge=1, le=settings.REPORT_LIST_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    q: Optional[str] = Query(None, description="Text search over report topics"),
+    depth: Optional[str] = Query(None, description="Only reports of this research depth"),
+    fields: Optional[str] = Query(None, description="Comma-separated summary fields to return"),
+):
+    """
+    List reports, newest first, a page at a time.
+
+    Pages are keyset-paginated on (created_at, report_id), so each page is
+    an index range scan however deep the client pages. Only summary fields
+    are read; fetch a report's content and sources from /api/report/{id}.
+
+    Args:
+        limit: Page size
+        cursor: Opaque position returned as next_cursor by the previous page
+        q: Text search over topics (uses the topic text index)
+        depth: Filter by research depth
+        fields: Subset of the summary fields to return; report_id and
+            created_at are always included
+
+    Returns:
+        ReportListResponse with the page and the cursor for the next one
+        (null on the last page)
+
+    Raises:
+        HTTPException: 400 for a malformed cursor or unknown field
+    """
+    try:
+        projection = _projection(fields)
+        query = decode_cursor(cursor) if cursor else {}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if q:
+        query["$text"] = {"$search": q}
+    if depth:
+        query["depth"] = depth
+
+    try:
+        logger.info(f"Listing reports (limit={limit}, q={q!r}, depth={depth}, after cursor={bool(cursor)})")
+
+        # Fetch one extra document to learn whether there is a next page
+        documents = await Report.get_motor_collection().find(query, projection).sort(
+            [("created_at", -1), ("report_id", -1)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            last = documents[-1]
+            next_cursor = encode_cursor(last["created_at"], last["report_id"])
+
+        return ReportListResponse(
+            reports=[ReportSummary(**document) for document in documents],
+            next_cursor=next_cursor,
+        )
+
+    except Exception as e:
+        error_msg = f"Failed to list reports: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+
 
 @router.get("/report/{report_id}", response_model=ReportResponse)
 async def get_report(report_id: str):
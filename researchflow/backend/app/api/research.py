@@ -1,25 +1,40 @@
 # API endpoints for researcher agent interaction
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+import asyncio
 import uuid
+from app.config import settings
 from app.schemas.research import ResearchRequest, ResearchResponse, StatusResponse
-from app.models.research import ResearchSession
-from app.workflow.graph import run_research_workflow
+from app.models.research import Report, ResearchSession
+from app.workflow.queue import enqueue_job, queue_stats
+from app.workflow.reuse import find_recent_report, find_running_session, topic_lock
+from app.utils.helpers import normalize_query
 from app.utils.logger import logger
+from app.utils.pubsub import broker, format_sse, publish_status
 
 router = APIRouter(prefix="/api", tags=["research"])
 
+# Events forwarded by the report text stream
+REPORT_STREAM_EVENTS = {"draft_start", "draft", "report_start", "report", "complete", "failed"}
+
+# Session statuses after which no further transitions happen
+TERMINAL_STATUSES = ("complete", "failed")
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 @router.post("/research", response_model=ResearchResponse)
-async def create_research(
-    request: ResearchRequest,
-    background_tasks: BackgroundTasks
-):
+async def create_research(request: ResearchRequest):
     """
-    Create a new research session and start the workflow in the background.
+    Create a new research session and queue its workflow for a worker.
+    
+    Unless request.reuse is false, a report for the same normalized topic and
+    depth created within REPORT_REUSE_WINDOW_SECONDS is served directly, and a
+    workflow already running for it is shared instead of starting another
+    (best-effort across API processes, see topic_lock).
     
     Args:
-        request: ResearchRequest containing topic and depth
-        background_tasks: FastAPI background tasks
+        request: ResearchRequest containing topic, depth and reuse flag
         
     Returns:
         ResearchResponse with session_id, status, and message
@@ -27,36 +42,144 @@ async def create_research(
     try:
         # Generate unique session ID
         session_id = str(uuid.uuid4())
+        topic_key = normalize_query(request.topic)
         
         logger.info(f"Creating research session for topic: {request.topic}")
         
-        # Create ResearchSession in MongoDB
-        session = ResearchSession(
+        if settings.REPORT_REUSE_ENABLED and request.reuse:
+            async with topic_lock(topic_key, request.depth):
+                shared = await _share_existing_work(session_id, request, topic_key)
+                if shared:
+                    return shared
+                await _insert_session(session_id, request, topic_key)
+        else:
+            await _insert_session(session_id, request, topic_key)
+        
+        logger.info(f"Research session created with ID: {session_id}")
+        publish_status(session_id, "pending", 0)
+        
+        # Queue the research workflow; a worker leases it from the durable queue
+        job_id = await enqueue_job(session_id)
+        
+        logger.info(f"Job {job_id} queued for session: {session_id}")
+        
+        return ResearchResponse(
             session_id=session_id,
-            topic=request.topic,
-            depth=request.depth,
             status="pending",
-            progress=0,
-            current_agent=None,
-            error_message=None
+            message="Research workflow queued successfully"
         )
-        await session.insert()
         
-        logger.info(f"Research session created with ID: {session_id}")
+    except Exception as e:
+        error_msg = f"Failed to create research session: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
+async def _insert_session(session_id: str, request: ResearchRequest, topic_key: str, **fields):
+    session = ResearchSession(
+        session_id=session_id,
+        topic=request.topic,
+        depth=request.depth,
+        topic_key=topic_key,
+        **{"status": "pending", "progress": 0, **fields}
+    )
+    await session.insert()
+    return session
+
+
+async def _share_existing_work(session_id: str, request: ResearchRequest, topic_key: str):
+    """
+    Serve a request from a recent report or an already-running workflow.
+    
+    Returns:
+        ResearchResponse if the request was shared, None if it needs its own run
+    """
+    report = await find_recent_report(topic_key, request.depth)
+    if report:
+        await _insert_session(
+            session_id, request, topic_key,
+            status="complete", progress=100, current_agent="editor", report_id=report.report_id
+        )
+        logger.info(f"Session {session_id} reuses report {report.report_id}")
+        return ResearchResponse(
+            session_id=session_id,
+            status="complete",
+            message="Served a recent report for this topic"
+        )
+    
+    leader = await find_running_session(topic_key, request.depth)
+    if leader:
+        await _insert_session(
+            session_id, request, topic_key,
+            status=leader.status,
+            progress=leader.progress,
+            current_agent=leader.current_agent,
+            attached_to=leader.session_id
+        )
+        # Status updates of the leader are written to followers too (SessionProgress.flush)
+        broker.alias(session_id, leader.session_id)
+        logger.info(f"Session {session_id} attached to running session {leader.session_id}")
+        return ResearchResponse(
+            session_id=session_id,
+            status=leader.status,
+            message="Attached to a running research workflow for this topic"
+        )
+    
+    return None
+
+
+@router.post("/research/{session_id}/resume", response_model=ResearchResponse)
+async def resume_research(session_id: str):
+    """
+    Resume a failed research session from its last completed node.
+    
+    Search, scrape and draft results checkpointed by earlier attempts are
+    reused, so only the nodes after the last checkpoint run again.
+    
+    Args:
+        session_id: The unique session identifier
         
-        # Add background task to run the research workflow
-        background_tasks.add_task(run_research_workflow, session_id)
+    Returns:
+        ResearchResponse with session_id, status, and message
         
-        logger.info(f"Background task scheduled for session: {session_id}")
+    Raises:
+        HTTPException: 404 if session not found, 409 if it has not failed
+    """
+    try:
+        session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
+        
+        if not session:
+            logger.warning(f"Session not found: {session_id}")
+            raise HTTPException(
+                status_code=404,
+                detail=f"Research session not found: {session_id}"
+            )
+        
+        if session.status != "failed":
+            raise HTTPException(
+                status_code=409,
+                detail=f"Only failed sessions can be resumed (status: {session.status})"
+            )
+        
+        await ResearchSession.find_one(ResearchSession.session_id == session_id).update(
+            {"$set": {"status": "pending", "error_message": None, "attached_to": None}}
+        )
+        broker.reopen(session_id)
+        publish_status(session_id, "pending")
+        
+        job_id = await enqueue_job(session_id, resume=True)
+        logger.info(f"Job {job_id} queued to resume session: {session_id}")
         
         return ResearchResponse(
             session_id=session_id,
             status="pending",
-            message="Research workflow started successfully"
+            message="Research workflow resumed from last checkpoint"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        error_msg = f"Failed to create research session: {str(e)}"
+        error_msg = f"Failed to resume research session: {str(e)}"
         logger.error(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
 
@@ -89,14 +212,7 @@ async def get_research_status(session_id: str):
             )
         
         # Return status response
-        return StatusResponse(
-            session_id=session.session_id,
-            status=session.status,
-            progress=getattr(session, 'progress', 0),
-            current_agent=getattr(session, 'current_agent', None),
-            report_id=getattr(session, 'report_id', None),
-            error_message=getattr(session, 'error_message', None)
-        )
+        return _status_response(session)
         
     except HTTPException:
         raise
@@ -104,3 +220,199 @@ async def get_research_status(session_id: str):
         error_msg = f"Failed to fetch session status: {str(e)}"
         logger.error(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
+
+
+@router.get("/research/{session_id}/stream")
+async def stream_research(session_id: str):
+    """
+    Stream the draft and final report text of a session as server-sent events.
+    
+    Events: draft_start ({"retry_count"}, plus "sections" when only those
+    sections are being rewritten), draft ({"text": delta}), report_start,
+    report ({"text": delta}), complete ({"report_id"}) and failed ({"error"}).
+    Clients that connect mid-generation first receive everything produced so far.
+    For sessions running in another process, the session is re-read after
+    STATUS_STREAM_FALLBACK_SECONDS without events and its stored result is
+    sent once it has finished.
+    
+    Args:
+        session_id: The unique session identifier
+        
+    Returns:
+        StreamingResponse of text/event-stream
+        
+    Raises:
+        HTTPException: 404 if session not found
+    """
+    # Subscribe before reading the session so no event falls between the two
+    queue = broker.subscribe(session_id)
+    
+    session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
+    if not session:
+        broker.unsubscribe(session_id, queue)
+        raise HTTPException(
+            status_code=404,
+            detail=f"Research session not found: {session_id}"
+        )
+    
+    if not broker.is_active(session_id) and session.status in TERMINAL_STATUSES:
+        # Finished before this process saw it: replay the stored result
+        broker.unsubscribe(session_id, queue)
+        return StreamingResponse(
+            _finished_session_events(session),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS
+        )
+    
+    logger.info(f"Streaming report text for session: {session_id}")
+    return StreamingResponse(
+        _report_events(queue, session_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+async def _report_events(queue: asyncio.Queue, session_id: str):
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=settings.STATUS_STREAM_FALLBACK_SECONDS)
+            except asyncio.TimeoutError:
+                if broker.is_active(session_id):
+                    yield ": keepalive\n\n"
+                    continue
+                
+                # Nothing published here: the session runs elsewhere, so poll once
+                session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
+                if not session:
+                    return
+                if session.status in TERMINAL_STATUSES:
+                    async for event in _finished_session_events(session):
+                        yield event
+                    return
+                yield ": keepalive\n\n"
+                continue
+            
+            if message is None:
+                return
+            if message["event"] in REPORT_STREAM_EVENTS:
+                yield format_sse(message["event"], message["data"])
+    finally:
+        broker.unsubscribe(session_id, queue)
+
+
+async def _finished_session_events(session: ResearchSession):
+    if session.status == "failed":
+        yield format_sse("failed", {"error": session.error_message})
+        return
+    
+    report = await Report.find_one(Report.report_id == session.report_id)
+    if report:
+        yield format_sse("report_start", {})
+        yield format_sse("report", {"text": report.content})
+    yield format_sse("complete", {"report_id": session.report_id})
+
+
+@router.get("/status/{session_id}/stream")
+async def stream_research_status(session_id: str):
+    """
+    Push status transitions of a session as server-sent "status" events.
+    
+    Sessions running in this process are served entirely from the in-process
+    broker without database reads. Otherwise the session is read once for a
+    snapshot, and re-read only after STATUS_STREAM_FALLBACK_SECONDS without
+    events (for sessions running in another process). GET /api/status remains
+    available for polling clients.
+    
+    Args:
+        session_id: The unique session identifier
+        
+    Returns:
+        StreamingResponse of text/event-stream
+        
+    Raises:
+        HTTPException: 404 if session not found
+    """
+    queue = broker.subscribe(session_id)
+    
+    snapshot = None
+    if not broker.is_active(session_id):
+        session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
+        if not session:
+            broker.unsubscribe(session_id, queue)
+            raise HTTPException(
+                status_code=404,
+                detail=f"Research session not found: {session_id}"
+            )
+        snapshot = _status_response(session)
+    
+    logger.info(f"Streaming status for session: {session_id}")
+    return StreamingResponse(
+        _status_events(queue, session_id, snapshot),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+def _status_response(session: ResearchSession) -> StatusResponse:
+    return StatusResponse(
+        session_id=session.session_id,
+        status=session.status,
+        progress=getattr(session, 'progress', 0),
+        current_agent=getattr(session, 'current_agent', None),
+        report_id=getattr(session, 'report_id', None),
+        error_message=getattr(session, 'error_message', None)
+    )
+
+
+async def _status_events(queue: asyncio.Queue, session_id: str, snapshot: StatusResponse = None):
+    try:
+        last = snapshot
+        if snapshot:
+            yield format_sse("status", snapshot.model_dump())
+            if snapshot.status in TERMINAL_STATUSES:
+                return
+        
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=settings.STATUS_STREAM_FALLBACK_SECONDS)
+            except asyncio.TimeoutError:
+                if broker.is_active(session_id):
+                    yield ": keepalive\n\n"
+                    continue
+                
+                # Nothing published here: the session runs elsewhere, so poll once
+                session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
+                if not session:
+                    return
+                current = _status_response(session)
+                if current != last:
+                    yield format_sse("status", current.model_dump())
+                    last = current
+                if current.status in TERMINAL_STATUSES:
+                    return
+                continue
+            
+            if message is None:
+                return
+            if message["event"] == "status":
+                # Attached sessions follow their leader's channel; report under their own id
+                yield format_sse("status", {**message["data"], "session_id": session_id})
+    finally:
+        broker.unsubscribe(session_id, queue)
+
+
+@router.get("/queue/stats")
+async def get_queue_stats():
+    """
+    Get job queue depth and wait times.
+    
+    Returns:
+        Dictionary with queued and running job counts and wait-time statistics
+    """
+    try:
+        return await queue_stats()
+    except Exception as e:
+        error_msg = f"Failed to fetch queue stats: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -11,6 +12,129 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     FRONTEND_URL: str = "http://localhost:5173"
 
+    # MongoDB connection pool
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SOCKET_TIMEOUT_MS: int = 30000
+
+    # Shared HTTP client
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_USER_AGENT: str = "Mozilla/5.0 (compatible; ResearchFlow/1.0)"
+
+    # Job queue and workers
+    WORKER_EMBEDDED: bool = True
+    WORKER_CONCURRENCY: int = 4
+    JOB_LEASE_SECONDS: float = 60.0
+    JOB_HEARTBEAT_SECONDS: float = 15.0
+    JOB_MAX_ATTEMPTS: int = 3
+    WORKER_METRICS_PORT: Optional[int] = None  # /metrics port of standalone workers
+    JOB_POLL_INTERVAL: float = 2.0
+
+    # Writer context
+    WRITER_CONTEXT_TOKEN_BUDGET: int = 6000
+    CONTEXT_CHUNK_WORDS: int = 120
+    CONTEXT_DEDUPE_THRESHOLD: float = 0.7
+    CONTEXT_MAX_CHUNKS_PER_SOURCE: int = 6
+
+    # Deep research (map-reduce over per-source summaries)
+    DEEP_MAP_CONCURRENCY: int = 6
+    DEEP_SUMMARY_WORDS: int = 200
+    DEEP_SUMMARY_MAX_TOKENS: int = 400
+    DEEP_SUMMARY_TEMPERATURE: float = 0.0
+
+    # Draft quality gate
+    QUALITY_MIN_WORDS: int = 500
+    QUALITY_MIN_SECTION_WORDS: int = 40
+    QUALITY_MIN_CITATION_COVERAGE: float = 0.5
+    QUALITY_MAX_REPETITION: float = 0.15
+    QUALITY_MAX_REWRITES: int = 2
+
+    # Editor
+    EDITOR_SECTION_CONCURRENCY: int = 4
+    EDITOR_SECTION_MAX_TOKENS: int = 2000
+
+    # Report reuse
+    REPORT_REUSE_ENABLED: bool = True
+    REPORT_REUSE_WINDOW_SECONDS: float = 6 * 60 * 60
+    REPORT_ATTACH_WINDOW_SECONDS: float = 30 * 60
+
+    # Report listing
+    REPORT_LIST_DEFAULT_LIMIT: int = 20
+    REPORT_LIST_MAX_LIMIT: int = 100
+
+    # Workflow deadlines
+    RESEARCHER_TIMEOUT: float = 180
+    WRITER_TIMEOUT: float = 300
+    EDITOR_TIMEOUT: float = 300
+    SESSION_DEADLINE_SECONDS: float = 900
+
+    # Status streaming
+    STATUS_STREAM_FALLBACK_SECONDS: float = 15.0
+    PROGRESS_COALESCE_SECONDS: float = 0.5
+
+    # LLM client
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MAX_CONNECTIONS: int = 16
+    LLM_BASE_URL: Optional[str] = None  # Groq-compatible endpoint; default is Groq's API
+    LLM_TIMEOUT: float = 60.0
+
+    # LLM rate limits, retries and failover (limits apply per model; match your Groq tier)
+    LLM_REQUESTS_PER_MINUTE: int = 1000
+    LLM_TOKENS_PER_MINUTE: int = 300000
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE: float = 0.5
+    LLM_BACKOFF_MAX: float = 20.0
+    LLM_FALLBACK_MODELS: List[str] = ["llama-3.1-8b-instant"]
+    LLM_FALLBACK_AFTER_SECONDS: float = 10.0  # switch models rather than wait out a longer Retry-After
+    LLM_HEDGE_DELAY: Optional[float] = None  # seconds before a duplicate non-streaming request; None disables
+    LLM_BREAKER_FAILURES: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+
+    # LLM response cache: off, opt_in (calls made with cache=True at
+    # temperature 0), all (record every call, for benchmarks), or replay
+    # (serve every call from the cache and fail on a miss)
+    LLM_CACHE_MODE: str = "opt_in"
+    LLM_CACHE_PATH: str = "llm_cache.db"
+    LLM_CACHE_TTL: float = 24 * 60 * 60
+    LLM_CACHE_MAX_BYTES: int = 100 * 1024 * 1024
+
+    # Web search
+    SEARCH_PROVIDERS: List[str] = ["tavily", "duckduckgo"]
+    SEARCH_STRATEGY: str = "hedge"
+    SEARCH_PROVIDER_TIMEOUT: float = 8.0
+    SEARCH_HEDGE_DELAY: float = 2.0
+    SEARCH_MERGE_GRACE: float = 0.5
+    TAVILY_API_URL: str = "https://api.tavily.com/search"
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL: float = 60 * 60
+    SEARCH_CACHE_MAX_ENTRIES: int = 1000
+
+    # Scraping
+    SCRAPE_CONCURRENCY: int = 5
+    SCRAPE_PER_HOST_LIMIT: int = 2
+    SCRAPE_STAGE_TIMEOUT: float = 20.0
+    SCRAPE_MAX_BYTES: int = 2 * 1024 * 1024
+    SCRAPE_MAX_CONTENT_CHARS: int = 5000
+    SCRAPE_TEXT_HEADROOM: float = 4.0
+    SCRAPE_ALLOWED_CONTENT_TYPES: List[str] = ["text/html", "application/xhtml+xml", "text/plain"]
+    SCRAPER_EXTRACTOR: str = "lxml"
+    SCRAPER_MAIN_CONTENT: bool = True
+    SCRAPER_PARSE_POOL: str = "process"
+    SCRAPER_PARSE_WORKERS: int = 2
+    SCRAPE_CACHE_ENABLED: bool = True
+    SCRAPE_CACHE_PATH: str = "scrape_cache.db"
+    SCRAPE_CACHE_TTL: float = 6 * 60 * 60
+    SCRAPE_CACHE_MAX_BYTES: int = 200 * 1024 * 1024
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,22 +1,40 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from app.config import settings
-from app.models.research import ResearchSession, Report
+from app.models.research import ResearchSession, Report, ResearchJob, WorkflowCheckpoint
 
 # Global variables
 client = None
 database = None
 
 
+def _build_client():
+    if settings.MONGODB_URL.startswith("mongomock://"):
+        # In-memory stand-in for offline benchmarks and demos (pip install mongomock-motor)
+        from mongomock_motor import AsyncMongoMockClient
+        return AsyncMongoMockClient()
+
+    return AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+    )
+
+
 async def connect_to_mongo():
-    """Connect to MongoDB and initialize Beanie"""
+    """Connect to MongoDB (or the in-memory mongomock:// stand-in) and initialize Beanie"""
     global client, database
 
-    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    client = _build_client()
     database = client[settings.DATABASE_NAME]
 
-    # Initialize Beanie with document models
-    await init_beanie(database=database, document_models=[ResearchSession, Report])
+    # Initialize Beanie with document models (also creates their indexes)
+    await init_beanie(database=database, document_models=[ResearchSession, Report, ResearchJob, WorkflowCheckpoint])
 
     print(f"✅ Connected to MongoDB: {settings.DATABASE_NAME}")
 
@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from app.database import connect_to_mongo, close_mongo_connection
+from app.tools.http_client import init_http_client, close_http_client
+from app.tools.llm import init_llm_client, close_llm_client
+from app.tools.llm_cache import init_llm_cache, close_llm_cache, get_llm_cache
+from app.tools.scraper import init_parse_pool, close_parse_pool
+from app.tools.scrape_cache import init_scrape_cache, close_scrape_cache, get_scrape_cache
+from app.tools.web_search import search_cache
+from app.workflow.worker import start_worker_pool, stop_worker_pool
+from app.agents.quality import get_quality_stats
 from app.api import research, reports
+from app.utils.metrics import CONTENT_TYPE_LATEST, render_metrics
 
 app = FastAPI()
 
@@ -29,10 +38,48 @@ app.include_router(reports.router)
 def read_root():
     return {"message": "Welcome to ResearchFlow API"}
 
+@app.get("/api/cache/stats")
+def read_cache_stats():
+    cache = get_scrape_cache()
+    llm_cache = get_llm_cache()
+    return {
+        "scrape": cache.stats() if cache else None,
+        "search": search_cache.stats(),
+        "llm": llm_cache.stats() if llm_cache else None,
+    }
+
+@app.get("/metrics")
+async def read_metrics():
+    """Prometheus metrics for this process"""
+    return Response(await render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/api/quality/stats")
+def read_quality_stats():
+    return get_quality_stats()
+
+async def on_startup_resources():
+    """Open the database and shared clients used by the API and workers"""
+    await connect_to_mongo()
+    await init_http_client()
+    await init_scrape_cache()
+    await init_parse_pool()
+    await init_llm_client()
+    await init_llm_cache()
+
+async def on_shutdown_resources():
+    await close_http_client()
+    await close_scrape_cache()
+    await close_parse_pool()
+    await close_llm_client()
+    await close_llm_cache()
+    await close_mongo_connection()
+
 @app.on_event("startup")
 async def on_startup():
-    await connect_to_mongo()
+    await on_startup_resources()
+    await start_worker_pool()
 
 @app.on_event("shutdown")
 async def on_shutdown():
-    await close_mongo_connection()
+    await stop_worker_pool()
+    await on_shutdown_resources()
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from beanie import Document
+from beanie import Document, Indexed
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 
 
 class ResearchSession(Document):
-    session_id: str = Field(..., description="Unique session identifier", unique=True)
+    session_id: Indexed(str, unique=True) = Field(..., description="Unique session identifier")
     topic: str = Field(..., description="Research topic")
     depth: str = Field(default="medium", description="Research depth")
     status: str = Field(default="pending", description="Current status of the research session")
@@ -14,20 +15,77 @@ class ResearchSession(Document):
     current_agent: Optional[str] = Field(default=None, description="Currently active agent")
     report_id: Optional[str] = Field(default=None, description="Generated report ID")
     error_message: Optional[str] = Field(default=None, description="Error message if failed")
+    topic_key: Optional[str] = Field(default=None, description="Normalized topic used to share work")
+    attached_to: Optional[str] = Field(default=None, description="Session whose workflow this one follows")
+    rewrites: List[dict] = Field(default_factory=list, description="Cost of each targeted draft rewrite")
+    timings: List[dict] = Field(default_factory=list, description="Queue and wall time of each node run")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Settings:
         name = "research_sessions"
+        indexes = [
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+            IndexModel(
+                [("topic_key", ASCENDING), ("depth", ASCENDING), ("created_at", DESCENDING)],
+                name="topic_key_depth_created_at",
+            ),
+            IndexModel([("attached_to", ASCENDING)], name="attached_to", sparse=True),
+        ]
 
 
 class Report(Document):
-    report_id: str = Field(..., description="Unique report identifier", unique=True)
-    session_id: str = Field(..., description="Associated session ID")
+    report_id: Indexed(str, unique=True) = Field(..., description="Unique report identifier")
+    session_id: Indexed(str) = Field(..., description="Associated session ID")
     topic: str = Field(..., description="Research topic")
     content: str = Field(..., description="Full report content in markdown")
     sources: List[dict] = Field(default_factory=list, description="List of sources used")
     word_count: int = Field(..., description="Word count of the report")
+    topic_key: Optional[str] = Field(default=None, description="Normalized topic used for reuse")
+    depth: Optional[str] = Field(default=None, description="Research depth")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     class Settings:
         name = "reports"
+        indexes = [
+            IndexModel(
+                [("topic_key", ASCENDING), ("depth", ASCENDING), ("created_at", DESCENDING)],
+                name="topic_key_depth_created_at",
+            ),
+            # Keyset pagination for GET /api/reports, newest first
+            IndexModel([("created_at", DESCENDING), ("report_id", DESCENDING)], name="created_at_report_id"),
+            IndexModel([("topic", TEXT)], name="topic_text"),
+        ]
+
+
+class ResearchJob(Document):
+    job_id: Indexed(str, unique=True) = Field(..., description="Unique job identifier")
+    session_id: str = Field(..., description="Session the job runs the workflow for")
+    resume: bool = Field(default=False, description="Resume from the session's last checkpoint")
+    status: str = Field(default="queued", description="queued, running, done or failed")
+    attempts: int = Field(default=0, description="Number of times the job has been leased")
+    worker_id: Optional[str] = Field(default=None, description="Worker holding the lease")
+    lease_expires_at: Optional[datetime] = Field(default=None, description="When the lease lapses without a heartbeat")
+    error_message: Optional[str] = Field(default=None, description="Error message if failed")
+    enqueued_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = Field(default=None, description="When the current lease was taken")
+    finished_at: Optional[datetime] = Field(default=None, description="When the job finished")
+
+    class Settings:
+        name = "research_jobs"
+        indexes = [
+            IndexModel([("status", ASCENDING), ("enqueued_at", ASCENDING)], name="status_enqueued_at"),
+            IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"),
+        ]
+
+
+class WorkflowCheckpoint(Document):
+    session_id: Indexed(str, unique=True) = Field(..., description="Checkpointed session ID")
+    completed_nodes: List[str] = Field(default_factory=list, description="Nodes whose output is saved")
+    search_results: List[dict] = Field(default_factory=list, description="Researcher search results")
+    scraped_content: List[dict] = Field(default_factory=list, description="Researcher scraped content")
+    draft_report: Optional[str] = Field(default=None, description="Writer draft report")
+    retry_count: int = Field(default=0, description="Rewrite attempts so far")
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "workflow_checkpoints"
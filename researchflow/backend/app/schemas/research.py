@@ -6,6 +6,7 @@ from datetime import datetime
 class ResearchRequest(BaseModel):
     topic: str
     depth: str = "medium"
+    reuse: bool = True  # share a running workflow or a recent report for the same topic
 
 
 class ResearchResponse(BaseModel):
@@ -37,3 +38,18 @@ class ReportResponse(BaseModel):
     sources: List[SourceDict]
     word_count: int
     created_at: datetime
+
+
+class ReportSummary(BaseModel):
+    """A report in a listing; optional fields are present only when requested"""
+    report_id: str
+    created_at: datetime
+    session_id: Optional[str] = None
+    topic: Optional[str] = None
+    depth: Optional[str] = None
+    word_count: Optional[int] = None
+
+
+class ReportListResponse(BaseModel):
+    reports: List[ReportSummary]
+    next_cursor: Optional[str] = None
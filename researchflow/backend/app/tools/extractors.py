@@ -0,0 +1,213 @@
+import re
+from typing import Callable, Dict, Tuple
+
+# Tags that never hold article text
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "footer", "aside", "header", "form", "iframe", "svg"]
+
+# class/id fragments that mark navigation, promos and comment threads
+_BOILERPLATE_ATTR_RE = re.compile(
+    r"comment|sidebar|menu|cookie|banner|breadcrumb|share|social|related|promo|advert|subscribe|newsletter|popup|footer|nav",
+    re.I,
+)
+_MAIN_CONTENT_HINT_RE = re.compile(r"article|content|entry|main|post|story|body|text", re.I)
+_XML_DECLARATION_RE = re.compile(r"^\s*<\?xml[^>]*\?>", re.I)
+
+# Main-content candidates below this many characters fall back to the whole body
+MIN_MAIN_CONTENT_CHARS = 250
+_MIN_PARAGRAPH_CHARS = 25
+
+
+def _clean_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def extract_bs4(html: str, main_content: bool = False) -> Tuple[str, str]:
+    """
+    Extract title and text with BeautifulSoup and the pure-Python html.parser.
+
+    This is the original scraper implementation, kept as the always-available
+    fallback and as the benchmark baseline.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for tag in soup.find_all(['script', 'style', 'nav', 'footer', 'aside']):
+        tag.decompose()
+
+    title_tag = soup.find('title')
+    title = title_tag.get_text(strip=True) if title_tag else "No title"
+
+    root = soup
+    if main_content:
+        candidate = soup.find('article') or soup.find('main') or soup.find(attrs={"role": "main"})
+        if candidate and len(candidate.get_text(strip=True)) >= MIN_MAIN_CONTENT_CHARS:
+            root = candidate
+
+    return title, _clean_text(root.get_text(separator=' ', strip=True))
+
+
+def extract_lxml(html: str, main_content: bool = True) -> Tuple[str, str]:
+    """
+    Extract title and text with lxml, optionally keeping only the main content.
+
+    Main content is found readability-style: every paragraph scores its parent
+    (and half to its grandparent) by length and comma count, scores are damped
+    by link density, and the best-scoring block wins.
+    """
+    import lxml.html
+    from lxml.etree import ParserError
+
+    html = _XML_DECLARATION_RE.sub("", html, count=1)
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except (ParserError, ValueError):
+        return "No title", ""
+
+    title = _clean_text(doc.findtext(".//title") or "") or "No title"
+
+    for element in doc.xpath("//" + " | //".join(BOILERPLATE_TAGS)):
+        element.drop_tree()
+
+    body = doc.find("body")
+    if body is None:
+        body = doc
+
+    if main_content:
+        _drop_boilerplate_blocks(body)
+        candidate = _best_candidate(body)
+        if candidate is not None:
+            text = _clean_text(candidate.text_content())
+            if len(text) >= MIN_MAIN_CONTENT_CHARS:
+                return title, text
+
+    return title, _clean_text(body.text_content())
+
+
+def _drop_boilerplate_blocks(body) -> None:
+    """Remove blocks whose class or id marks them as page chrome"""
+    for element in list(body.iter("div", "section", "ul", "ol", "table", "span", "p")):
+        if element.getparent() is None:
+            continue
+        attrs = f"{element.get('class', '')} {element.get('id', '')}"
+        if _BOILERPLATE_ATTR_RE.search(attrs) and not _MAIN_CONTENT_HINT_RE.search(attrs):
+            element.drop_tree()
+
+
+def _link_density(element) -> float:
+    text_length = len(_clean_text(element.text_content()))
+    if not text_length:
+        return 1.0
+    link_length = sum(len(_clean_text(link.text_content())) for link in element.iter("a"))
+    return link_length / text_length
+
+
+def _best_candidate(body):
+    scores: Dict[object, float] = {}
+
+    for paragraph in body.iter("p", "pre", "blockquote", "td"):
+        text = _clean_text(paragraph.text_content())
+        if len(text) < _MIN_PARAGRAPH_CHARS:
+            continue
+
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        parent = paragraph.getparent()
+        if parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0.0) + score
+
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0.0) + score / 2
+
+    if not scores:
+        return None
+
+    best, best_score = None, 0.0
+    for element, score in scores.items():
+        attrs = f"{element.get('class', '')} {element.get('id', '')}"
+        if element.tag in ("article", "main") or _MAIN_CONTENT_HINT_RE.search(attrs):
+            score *= 1.25
+        score *= 1 - _link_density(element)
+        if score > best_score:
+            best, best_score = element, score
+
+    return best
+
+
+def extract_selectolax(html: str, main_content: bool = True) -> Tuple[str, str]:
+    """
+    Extract title and text with selectolax's Lexbor backend.
+
+    The fastest parser, but main-content detection is limited to semantic
+    containers (article, main, role=main).
+    """
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+
+    title_node = tree.css_first("title")
+    title = _clean_text(title_node.text()) if title_node else ""
+
+    tree.strip_tags(BOILERPLATE_TAGS)
+
+    root = tree.body or tree.root
+    if root is None:
+        return title or "No title", ""
+
+    if main_content:
+        candidate = tree.css_first("article") or tree.css_first("main") or tree.css_first("[role=main]")
+        if candidate is not None:
+            text = _clean_text(candidate.text(separator=" "))
+            if len(text) >= MIN_MAIN_CONTENT_CHARS:
+                return title or "No title", text
+
+    return title or "No title", _clean_text(root.text(separator=" "))
+
+
+EXTRACTORS: Dict[str, Callable[..., Tuple[str, str]]] = {
+    "bs4": extract_bs4,
+    "lxml": extract_lxml,
+    "selectolax": extract_selectolax,
+}
+
+_available: Dict[str, bool] = {}
+
+
+def is_available(backend: str) -> bool:
+    """Check whether the optional parser behind a backend is installed"""
+    if backend not in _available:
+        module = {"bs4": "bs4", "lxml": "lxml.html", "selectolax": "selectolax.lexbor"}.get(backend)
+        try:
+            __import__(module)
+            _available[backend] = True
+        except (ImportError, TypeError):
+            _available[backend] = False
+    return _available[backend]
+
+
+def extract(html: str, backend: str = "lxml", main_content: bool = True, max_chars: int = 5000) -> Tuple[str, str]:
+    """
+    Extract the title and clean text of an HTML document.
+
+    Falls back to the bs4 backend when the requested parser is not installed.
+    Module-level and free of app settings so it can run in a worker process.
+
+    Args:
+        html: Raw HTML
+        backend: One of EXTRACTORS
+        main_content: Strip boilerplate and keep only the main content block
+        max_chars: Maximum length of the returned content
+
+    Returns:
+        Tuple of (title, content)
+    """
+    if backend not in EXTRACTORS or not is_available(backend):
+        backend = "bs4"
+
+    title, content = EXTRACTORS[backend](html, main_content=main_content)
+
+    if len(content) > max_chars:
+        content = content[:max_chars] + "..."
+
+    return title, content
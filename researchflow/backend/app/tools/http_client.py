@@ -0,0 +1,61 @@
+import httpx
+from app.config import settings
+from app.utils.logger import logger
+
+# Global variables
+http_client = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client used for scraping"""
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+
+    return httpx.AsyncClient(
+        http2=settings.HTTP2_ENABLED,
+        limits=limits,
+        timeout=timeout,
+        follow_redirects=True,
+        headers={"User-Agent": settings.HTTP_USER_AGENT},
+    )
+
+
+async def init_http_client():
+    """Create the process-wide HTTP client"""
+    global http_client
+
+    if http_client is None:
+        http_client = _build_client()
+        logger.info(
+            f"HTTP client ready (http2={settings.HTTP2_ENABLED}, "
+            f"max_connections={settings.HTTP_MAX_CONNECTIONS})"
+        )
+
+
+async def close_http_client():
+    """Close the process-wide HTTP client and its pooled connections"""
+    global http_client
+
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+        logger.info("HTTP client closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client.
+    
+    Falls back to creating it lazily when used outside the app lifespan
+    (scripts, shells), so callers never have to build their own client.
+    """
+    global http_client
+
+    if http_client is None:
+        http_client = _build_client()
+
+    return http_client
@@ -1,7 +1,38 @@
 import asyncio
-from groq import Groq
+import functools
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+import httpx
+from groq import APIConnectionError, AsyncGroq, InternalServerError, RateLimitError
 from app.config import settings
+from app.tools.llm_cache import get_llm_cache
 from app.utils.logger import logger
+from app.utils.metrics import (
+    LLM_CIRCUIT_OPEN,
+    LLM_FALLBACKS,
+    LLM_FIRST_TOKEN_SECONDS,
+    LLM_HEDGES,
+    LLM_RETRIES,
+    LLM_SECONDS,
+    LLM_SLOT_WAIT_SECONDS,
+    LLM_TOKENS,
+)
+from app.utils.resilience import CircuitBreaker, TokenBucket, backoff_delay, parse_duration, parse_retry_after
+
+# Global variables
+llm_client = None
+llm_semaphore = None
+rate_limits = {}  # model -> (requests bucket, tokens bucket)
+breakers = {}  # model -> CircuitBreaker
+
+# When set, collects the seconds each LLM call waited for quota and an in-flight slot
+llm_slot_waits: ContextVar[Optional[List[float]]] = ContextVar("llm_slot_waits", default=None)
+
+# When set, the time.monotonic() by which the calling node must finish; retries that would wait past it fail fast
+llm_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
 
 
 class LLMError(Exception):
@@ -9,29 +40,458 @@ class LLMError(Exception):
     pass
 
 
-async def call_llm(prompt: str, model: str = "llama-3.3-70b-versatile") -> str:
+def _build_client() -> AsyncGroq:
+    """Build the async Groq client on its own pooled HTTP client"""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+    # Retries happen in _Failover, which knows about rate limits and fallback models
+    return AsyncGroq(
+        api_key=settings.GROQ_API_KEY,
+        base_url=settings.LLM_BASE_URL,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+async def init_llm_client():
+    """Create the process-wide LLM client and in-flight limit"""
+    global llm_client, llm_semaphore
+
+    if llm_client is None:
+        llm_client = _build_client()
+        llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        logger.info(
+            f"LLM client ready (max in-flight={settings.LLM_MAX_CONCURRENCY}, "
+            f"{settings.LLM_REQUESTS_PER_MINUTE} RPM / {settings.LLM_TOKENS_PER_MINUTE} TPM per model)"
+        )
+
+
+async def close_llm_client():
+    """Close the LLM client and its pooled connections"""
+    global llm_client, llm_semaphore
+
+    if llm_client is not None:
+        await llm_client.close()
+        llm_client = None
+        llm_semaphore = None
+        logger.info("LLM client closed")
+
+
+def get_llm_client() -> AsyncGroq:
+    """Get the shared LLM client, creating it lazily outside the app lifespan"""
+    global llm_client, llm_semaphore
+
+    if llm_client is None:
+        llm_client = _build_client()
+        llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+    return llm_client
+
+
+def _limits_for(model: str) -> Tuple[TokenBucket, TokenBucket]:
+    """Get the requests-per-minute and tokens-per-minute buckets for a model"""
+    if model not in rate_limits:
+        rate_limits[model] = (
+            TokenBucket(settings.LLM_REQUESTS_PER_MINUTE),
+            TokenBucket(settings.LLM_TOKENS_PER_MINUTE),
+        )
+    return rate_limits[model]
+
+
+def _breaker_for(model: str) -> CircuitBreaker:
+    if model not in breakers:
+        breakers[model] = CircuitBreaker(settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET_SECONDS)
+    return breakers[model]
+
+
+def _estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Tokens to reserve for a call: the prompt (~4 chars a token) plus the full completion budget"""
+    return len(prompt) // 4 + max_tokens
+
+
+def _observe_headers(model: str, headers):
+    """Pull the local buckets down to the remaining quota Groq reports"""
+    requests, tokens = _limits_for(model)
+    for bucket, name in ((requests, "x-ratelimit-remaining-requests"), (tokens, "x-ratelimit-remaining-tokens")):
+        value = headers.get(name)
+        if value is not None:
+            try:
+                bucket.limit_to(float(value))
+            except ValueError:
+                pass
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After or Groq's reset headers"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    retry_after = parse_retry_after(response.headers.get("retry-after"))
+    if retry_after is None:
+        resets = [
+            parse_duration(response.headers.get(name))
+            for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        ]
+        resets = [reset for reset in resets if reset is not None]
+        retry_after = min(resets) if resets else None
+    return retry_after
+
+
+def _retry_reason(error: Exception) -> Optional[str]:
+    """Classify a failed attempt; None means retrying will not help"""
+    if isinstance(error, RateLimitError):
+        return "rate_limited"
+    if isinstance(error, InternalServerError):
+        return "server_error"
+    if isinstance(error, (APIConnectionError, httpx.TransportError)):
+        return "connection"
+    return None
+
+
+@asynccontextmanager
+async def _llm_slot(model: str, tokens: int):
+    """
+    Wait for rate-limit quota, then hold an in-flight slot.
+
+    Quota is taken before the slot so calls waiting out a rate limit do not
+    hold slots other models could use. The combined wait is recorded.
+    """
+    start = time.perf_counter()
+    requests, token_bucket = _limits_for(model)
+    await requests.acquire(1)
+    await token_bucket.acquire(tokens)
+    async with llm_semaphore:
+        wait = time.perf_counter() - start
+        LLM_SLOT_WAIT_SECONDS.observe(wait)
+        waits = llm_slot_waits.get()
+        if waits is not None:
+            waits.append(wait)
+        yield
+
+
+def _record_usage(model: str, usage, prompt: str, response: str, reserved: int = 0):
+    """
+    Count tokens from the API's usage block, estimating when it is missing.
+
+    Any part of the `reserved` token quota the call did not use is returned
+    to the model's bucket.
+    """
+    if usage is not None:
+        prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+    else:
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(response) // 4
+    LLM_TOKENS.labels(model, "prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(model, "completion").inc(completion_tokens)
+    if reserved > prompt_tokens + completion_tokens:
+        _limits_for(model)[1].refund(reserved - prompt_tokens - completion_tokens)
+
+
+class _Failover:
+    """
+    Retry policy for one LLM call across the requested model and its fallbacks.
+
+    Each attempt asks `next_model` which model to try. A failed attempt is
+    reported to `failed`, which re-raises errors that retrying cannot fix,
+    and otherwise backs off (honouring Retry-After) before the next one.
+    A model is abandoned for the next fallback when its retries run out, its
+    circuit breaker is open, or it is rate limited for longer than
+    LLM_FALLBACK_AFTER_SECONDS while a fallback is left to try.
+
+    Only 5xx and connection errors count towards the circuit breaker; a 429
+    means the model is up but saturated, and pacing that is the job of the
+    model's token buckets. A Retry-After is waited out in full; when that
+    would run past the caller's deadline (llm_deadline) the call fails
+    instead of retrying early into more 429s.
+    """
+
+    def __init__(self, model: str, action: str):
+        self.models = [model] + [m for m in settings.LLM_FALLBACK_MODELS if m != model]
+        self.action = action
+        self.index = 0
+        self.attempt = 0
+        self.last_error: Optional[Exception] = None
+
+    def next_model(self) -> Optional[str]:
+        while self.index < len(self.models):
+            model = self.models[self.index]
+            # Skip a model that is rate limited for a long time while there is another to try
+            saturated = (
+                _limits_for(model)[0].blocked_for() > settings.LLM_FALLBACK_AFTER_SECONDS
+                and self.index < len(self.models) - 1
+            )
+            if self.attempt <= settings.LLM_MAX_RETRIES and not saturated and _breaker_for(model).allow():
+                if self.index > 0 and self.attempt == 0:
+                    logger.warning(f"Falling back to LLM model {model}")
+                    LLM_FALLBACKS.labels(model).inc()
+                return model
+            self.index += 1
+            self.attempt = 0
+        return None
+
+    def succeeded(self, model: str):
+        _breaker_for(model).record_success()
+        LLM_CIRCUIT_OPEN.labels(model).set(0)
+
+    def record_failure(self, model: str):
+        breaker = _breaker_for(model)
+        breaker.record_failure()
+        LLM_CIRCUIT_OPEN.labels(model).set(int(breaker.state != "closed"))
+
+    def has_fallback(self) -> bool:
+        return self.index < len(self.models) - 1
+
+    async def failed(self, model: str, error: Exception):
+        """
+        Record a failed attempt and wait before the next one.
+
+        Raises:
+            LLMError: If the error is not worth retrying (bad request, auth, ...),
+                or the wait before the next attempt would pass llm_deadline
+        """
+        reason = _retry_reason(error)
+        if reason is None:
+            raise self.error(error) from error
+
+        self.last_error = error
+        self.attempt += 1
+        retry_after = _retry_after(error)
+
+        if reason == "rate_limited":
+            # The model answered, so a half-open trial is over without a verdict
+            _breaker_for(model).release()
+            if (
+                retry_after is not None
+                and retry_after > settings.LLM_FALLBACK_AFTER_SECONDS
+                and self.has_fallback()
+            ):
+                _limits_for(model)[0].block_for(retry_after)
+                logger.warning(f"LLM model {model} is rate limited for {retry_after:.0f}s, not waiting for it")
+                self.attempt = settings.LLM_MAX_RETRIES + 1
+                return
+            # Hold back every caller of this model, not only this one
+            _limits_for(model)[0].block_for(retry_after or backoff_delay(
+                self.attempt - 1, settings.LLM_BACKOFF_BASE, settings.LLM_BACKOFF_MAX
+            ))
+        else:
+            self.record_failure(model)
+
+        if self.attempt > settings.LLM_MAX_RETRIES:
+            logger.warning(f"Giving up on LLM model {model} after {self.attempt} attempts: {error}")
+            return
+
+        delay = backoff_delay(self.attempt - 1, settings.LLM_BACKOFF_BASE, settings.LLM_BACKOFF_MAX, retry_after)
+        deadline = llm_deadline.get()
+        if deadline is not None and time.monotonic() + delay > deadline:
+            error_msg = (
+                f"Failed to {self.action} LLM API: {model} asked to wait {delay:.0f}s ({reason}), "
+                f"past the deadline {max(deadline - time.monotonic(), 0):.0f}s away"
+            )
+            logger.error(error_msg)
+            raise LLMError(error_msg) from error
+        logger.warning(f"LLM attempt {self.attempt} on {model} failed ({reason}), retrying in {delay:.1f}s: {error}")
+        LLM_RETRIES.labels(model, reason).inc()
+        await asyncio.sleep(delay)
+
+    def error(self, cause: Optional[Exception] = None) -> LLMError:
+        cause = cause or self.last_error
+        detail = str(cause) if cause else f"circuit open for {', '.join(self.models)}"
+        error_msg = f"Failed to {self.action} LLM API: {detail}"
+        logger.error(error_msg)
+        return LLMError(error_msg)
+
+
+async def _hedged(send: Callable[[asyncio.Event], Awaitable[str]]) -> str:
     """
-    Call Groq LLM API asynchronously.
+    Run `send`, duplicating it if it is slow, and return the first success.
+
+    The hedge delay (LLM_HEDGE_DELAY) counts from when the first request
+    actually went out (`send` sets the event once it holds a slot), so
+    queueing for quota never triggers a duplicate.
+    """
+    if settings.LLM_HEDGE_DELAY is None:
+        return await send(asyncio.Event())
+
+    sent = asyncio.Event()
+    first = asyncio.ensure_future(send(sent))
+    pending = {first}
+    try:
+        waiter = asyncio.ensure_future(sent.wait())
+        await asyncio.wait({first, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        done, _ = await asyncio.wait({first}, timeout=settings.LLM_HEDGE_DELAY)
+        if done:
+            return first.result()
+
+        LLM_HEDGES.labels("sent").inc()
+        second = asyncio.ensure_future(send(asyncio.Event()))
+        pending.add(second)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        LLM_HEDGES.labels("won").inc()
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _complete(prompt: str, model: str, temperature: float, max_tokens: int, sent: asyncio.Event) -> str:
+    """One non-streaming completion attempt"""
+    client = get_llm_client()
+    reserved = _estimate_tokens(prompt, max_tokens)
+
+    # Wait for quota and an in-flight slot so bursts queue here instead of piling onto Groq
+    async with _llm_slot(model, reserved):
+        sent.set()
+        start = time.perf_counter()
+        try:
+            raw = await client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            completion = await raw.parse()
+        except Exception:
+            LLM_SECONDS.labels(model, "error").observe(time.perf_counter() - start)
+            raise
+        LLM_SECONDS.labels(model, "ok").observe(time.perf_counter() - start)
+
+    _observe_headers(model, raw.headers)
+    response = completion.choices[0].message.content
+    _record_usage(model, completion.usage, prompt, response, reserved)
+    return response
+
+
+async def call_llm(
+    prompt: str,
+    model: str = "llama-3.3-70b-versatile",
+    on_token: Optional[Callable[[str], None]] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+    cache: bool = False,
+) -> str:
+    """
+    Call Groq LLM API asynchronously over the shared client.
+
+    With `cache=True` and temperature 0 (or LLM_CACHE_MODE "all"/"replay")
+    the response is looked up in and stored to the LLM response cache; a
+    cached response is passed to `on_token` in one piece. Sampled calls
+    (temperature > 0) are never cached on opt-in, so asking again gives a
+    fresh answer. In replay mode a cache miss is an
+    error instead of an API call. Cache I/O errors (e.g. a locked database)
+    are logged and treated as a miss, or as a skipped store.
+
+    Calls are paced by per-model requests/tokens-per-minute buckets, retried
+    with jittered exponential backoff (honouring Retry-After) on rate limits,
+    5xx and connection errors, and moved to LLM_FALLBACK_MODELS when a model
+    stays unavailable or its circuit breaker is open. Non-streaming calls can
+    be hedged (LLM_HEDGE_DELAY).
     
     Args:
         prompt: The prompt to send to the LLM
         model: The model name to use (default: llama-3.3-70b-versatile)
+        on_token: Optional callback receiving each text delta as it streams in
+        temperature: Sampling temperature (default: 0.7)
+        max_tokens: Maximum tokens to generate (default: 2000)
+        cache: Use the LLM response cache if temperature is 0 (default: False)
         
     Returns:
         The generated text response from the LLM
         
     Raises:
-        LLMError: If the API call fails
+        LLMError: If the API call fails on every attempt and fallback model
     """
+    mode = settings.LLM_CACHE_MODE
+    cacheable = (cache and temperature == 0) or mode in ("all", "replay")
+    llm_cache = get_llm_cache() if cacheable else None
+    if llm_cache is None:
+        return await _call_llm(prompt, model, on_token, temperature, max_tokens)
+
+    key = llm_cache.make_key(prompt, model, temperature, max_tokens)
     try:
-        logger.info(f"Calling LLM with model: {model}")
-        
-        # Create Groq client
-        client = Groq(api_key=settings.GROQ_API_KEY)
-        
-        # Call the API in a thread pool since Groq SDK is sync
-        def _call_groq():
-            completion = client.chat.completions.create(
+        response = await llm_cache.get(key)
+    except sqlite3.Error as e:
+        logger.warning(f"LLM cache lookup failed, treating as a miss: {str(e)}")
+        response = None
+    if response is not None:
+        logger.info(f"LLM cache hit: {len(response)} characters")
+        if on_token is not None:
+            on_token(response)
+        return response
+    if mode == "replay":
+        error_msg = f"LLM cache miss in replay mode for model {model}"
+        logger.error(error_msg)
+        raise LLMError(error_msg)
+
+    response = await _call_llm(prompt, model, on_token, temperature, max_tokens)
+    try:
+        await llm_cache.put(key, model, response)
+    except sqlite3.Error as e:
+        logger.warning(f"LLM cache store skipped: {str(e)}")
+    return response
+
+
+async def _call_llm(
+    prompt: str,
+    model: str,
+    on_token: Optional[Callable[[str], None]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """call_llm without the response cache"""
+    if on_token is not None:
+        parts = []
+        async for delta in stream_llm(prompt, model=model, temperature=temperature, max_tokens=max_tokens):
+            on_token(delta)
+            parts.append(delta)
+        response = "".join(parts)
+        logger.info(f"LLM stream finished: {len(response)} characters")
+        return response
+
+    failover = _Failover(model, "call")
+    while (candidate := failover.next_model()) is not None:
+        logger.info(f"Calling LLM with model: {candidate}")
+        try:
+            response = await _hedged(functools.partial(_complete, prompt, candidate, temperature, max_tokens))
+        except Exception as e:
+            await failover.failed(candidate, e)
+            continue
+
+        failover.succeeded(candidate)
+        logger.info(f"LLM response received: {len(response)} characters")
+        return response
+
+    raise failover.error()
+
+
+async def _stream_once(prompt: str, model: str, temperature: float, max_tokens: int) -> AsyncIterator[str]:
+    """One streaming completion attempt"""
+    client = get_llm_client()
+    reserved = _estimate_tokens(prompt, max_tokens)
+    parts = []
+    usage = None
+
+    async with _llm_slot(model, reserved):
+        start = time.perf_counter()
+        try:
+            raw = await client.chat.completions.with_raw_response.create(
                 model=model,
                 messages=[
                     {
@@ -39,21 +499,74 @@ async def call_llm(prompt: str, model: str = "llama-3.3-70b-versatile") -> str:
                         "content": prompt
                     }
                 ],
-                temperature=0.7,
-                max_tokens=2000
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
             )
-            return completion.choices[0].message.content
-        
-        # Execute in thread pool
-        response = await asyncio.to_thread(_call_groq)
+            _observe_headers(model, raw.headers)
+            stream = await raw.parse()
+            async for chunk in stream:
+                if chunk.x_groq is not None and chunk.x_groq.usage is not None:
+                    usage = chunk.x_groq.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not parts:
+                        LLM_FIRST_TOKEN_SECONDS.labels(model).observe(time.perf_counter() - start)
+                    parts.append(delta)
+                    yield delta
+        except Exception:
+            LLM_SECONDS.labels(model, "error").observe(time.perf_counter() - start)
+            raise
+        LLM_SECONDS.labels(model, "ok").observe(time.perf_counter() - start)
+    _record_usage(model, usage, prompt, "".join(parts), reserved)
+
+
+async def stream_llm(
+    prompt: str,
+    model: str = "llama-3.3-70b-versatile",
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+) -> AsyncIterator[str]:
+    """
+    Stream a Groq completion as it is generated.
+
+    Failures before the first token are retried like call_llm (backoff,
+    fallback models); once text has been yielded a failure is final, since
+    the caller has already consumed part of the response.
+    
+    Args:
+        prompt: The prompt to send to the LLM
+        model: The model name to use (default: llama-3.3-70b-versatile)
+        temperature: Sampling temperature (default: 0.7)
+        max_tokens: Maximum tokens to generate (default: 2000)
         
-        logger.info(f"LLM response received: {len(response)} characters")
-        return response
+    Yields:
+        Text deltas in generation order
         
-    except Exception as e:
-        error_msg = f"Failed to call LLM API: {str(e)}"
-        logger.error(error_msg)
-        raise LLMError(error_msg) from e
+    Raises:
+        LLMError: If the API call fails
+    """
+    failover = _Failover(model, "stream")
+    while (candidate := failover.next_model()) is not None:
+        logger.info(f"Streaming LLM with model: {candidate}")
+        started = False
+        try:
+            async for delta in _stream_once(prompt, candidate, temperature, max_tokens):
+                started = True
+                yield delta
+        except Exception as e:
+            if started:
+                failover.record_failure(candidate)
+                raise failover.error(e) from e
+            await failover.failed(candidate, e)
+            continue
+
+        failover.succeeded(candidate)
+        return
+
+    raise failover.error()
 
 
 def get_llm():
@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.config import settings
+from app.utils.logger import logger
+
+# Global variables
+llm_cache = None
+
+CACHE_MODES = ("off", "opt_in", "all", "replay")
+
+_SPACES_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize whitespace that does not change what the model is asked"""
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in prompt.strip().splitlines())
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines))
+
+
+class LLMCache:
+    """
+    On-disk cache of LLM responses, keyed on model, sampling parameters and
+    the normalized prompt.
+
+    Entries expire after `ttl` seconds unless `ignore_ttl` is set (replay
+    mode). Once the stored responses exceed `max_bytes` the least recently
+    used entries are evicted. SQLite in WAL mode lets API and worker
+    processes share one file.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int, ignore_ttl: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.ignore_ttl = ignore_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "prompt": normalize_prompt(prompt),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (not self.ignore_ttl and now - row[1] >= self.ttl):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def _put(self, key: str, model: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until the cache fits in max_bytes"""
+        if not self.ignore_ttl:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+            self.evictions += cursor.rowcount
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached response, or None if missing or expired"""
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, model: str, response: str):
+        """Store a response"""
+        await asyncio.to_thread(self._put, key, model, response)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+async def init_llm_cache():
+    """Open the LLM response cache unless LLM_CACHE_MODE is "off" """
+    global llm_cache
+
+    if settings.LLM_CACHE_MODE not in CACHE_MODES:
+        raise ValueError(f"LLM_CACHE_MODE must be one of {', '.join(CACHE_MODES)}, got {settings.LLM_CACHE_MODE!r}")
+
+    if settings.LLM_CACHE_MODE != "off" and llm_cache is None:
+        llm_cache = await asyncio.to_thread(
+            LLMCache,
+            settings.LLM_CACHE_PATH,
+            settings.LLM_CACHE_TTL,
+            settings.LLM_CACHE_MAX_BYTES,
+            settings.LLM_CACHE_MODE == "replay",
+        )
+        logger.info(f"LLM cache opened at {settings.LLM_CACHE_PATH} (mode={settings.LLM_CACHE_MODE})")
+
+
+async def close_llm_cache():
+    """Close the LLM response cache"""
+    global llm_cache
+
+    if llm_cache is not None:
+        llm_cache.close()
+        llm_cache = None
+        logger.info("LLM cache closed")
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Get the LLM cache, or None when caching is off or not started"""
+    return llm_cache
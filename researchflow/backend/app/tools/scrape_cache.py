@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.config import settings
+from app.utils.helpers import normalize_url
+from app.utils.logger import logger
+
+# Global variables
+scrape_cache = None
+
+
+class ScrapeCache:
+    """
+    On-disk cache of extracted page content, keyed on the normalized URL.
+    
+    Entries are fresh for `ttl` seconds. Stale entries are kept so their
+    ETag/Last-Modified can be used to revalidate with a conditional request.
+    Once the stored content exceeds `max_bytes` the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scrape_cache_accessed ON scrape_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def _get(self, url: str) -> Optional[dict]:
+        key = self.make_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, content, etag, last_modified, fetched_at FROM scrape_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE scrape_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+            title, content, etag, last_modified, fetched_at = row
+            fresh = now - fetched_at < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return {
+            "title": title,
+            "content": content,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": fresh,
+        }
+
+    def _put(self, url: str, title: str, content: str, etag: Optional[str], last_modified: Optional[str]):
+        key = self.make_key(url)
+        now = time.time()
+        size = len(title.encode("utf-8")) + len(content.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO scrape_cache
+                    (key, url, title, content, etag, last_modified, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, url, title, content, etag, last_modified, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _touch(self, url: str):
+        now = time.time()
+        with self._lock:
+            self.revalidations += 1
+            self._conn.execute(
+                "UPDATE scrape_cache SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, self.make_key(url)),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM scrape_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM scrape_cache ORDER BY accessed_at ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM scrape_cache WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    async def get(self, url: str) -> Optional[dict]:
+        """Look up a URL, returning the cached entry (fresh or stale) or None"""
+        return await asyncio.to_thread(self._get, url)
+
+    async def put(self, url: str, title: str, content: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store the extracted title and content for a URL"""
+        await asyncio.to_thread(self._put, url, title, content, etag, last_modified)
+
+    async def touch(self, url: str):
+        """Mark a stale entry fresh again after a 304 Not Modified"""
+        await asyncio.to_thread(self._touch, url)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+async def init_scrape_cache():
+    """Open the scrape cache if it is enabled"""
+    global scrape_cache
+
+    if settings.SCRAPE_CACHE_ENABLED and scrape_cache is None:
+        scrape_cache = await asyncio.to_thread(
+            ScrapeCache,
+            settings.SCRAPE_CACHE_PATH,
+            settings.SCRAPE_CACHE_TTL,
+            settings.SCRAPE_CACHE_MAX_BYTES,
+        )
+        logger.info(f"Scrape cache opened at {settings.SCRAPE_CACHE_PATH}")
+
+
+async def close_scrape_cache():
+    """Close the scrape cache"""
+    global scrape_cache
+
+    if scrape_cache is not None:
+        scrape_cache.close()
+        scrape_cache = None
+        logger.info("Scrape cache closed")
+
+
+def get_scrape_cache() -> Optional[ScrapeCache]:
+    """Get the scrape cache, or None when caching is disabled or not started"""
+    return scrape_cache
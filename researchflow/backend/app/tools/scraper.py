@@ -1,6 +1,73 @@
+import asyncio
+import codecs
+import multiprocessing
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 import httpx
-from bs4 import BeautifulSoup
+from app.config import settings
+from app.tools.extractors import extract, is_available
+from app.tools.http_client import get_http_client
+from app.tools.scrape_cache import get_scrape_cache
 from app.utils.logger import logger
+from app.utils.metrics import SCRAPE_BYTES, SCRAPE_SECONDS
+
+# Rough visible-text estimate used to stop streaming once a page has enough text
+_NON_TEXT_RE = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>", re.S | re.I)
+_MIN_TEXT_CHECK_BYTES = 64 * 1024
+
+# Global variables
+parse_pool = None
+
+
+class UnsupportedContentError(Exception):
+    """Raised when a URL does not serve an HTML or text document"""
+    pass
+
+
+def _build_parse_pool() -> Executor:
+    """Build the worker pool that runs HTML extraction"""
+    workers = settings.SCRAPER_PARSE_WORKERS
+    if settings.SCRAPER_PARSE_POOL == "process":
+        # spawn keeps the children free of the parent's event loop and driver threads
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+
+
+async def init_parse_pool():
+    """Create the HTML parse pool"""
+    global parse_pool
+
+    if parse_pool is None:
+        parse_pool = _build_parse_pool()
+        if not is_available(settings.SCRAPER_EXTRACTOR):
+            logger.warning(f"Extractor '{settings.SCRAPER_EXTRACTOR}' is not installed, falling back to bs4")
+        logger.info(
+            f"Parse pool ready ({settings.SCRAPER_PARSE_POOL}, {settings.SCRAPER_PARSE_WORKERS} workers, "
+            f"extractor={settings.SCRAPER_EXTRACTOR})"
+        )
+
+
+async def close_parse_pool():
+    """Shut down the HTML parse pool"""
+    global parse_pool
+
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+        parse_pool = None
+        logger.info("Parse pool closed")
+
+
+def get_parse_pool() -> Executor:
+    """Get the parse pool, creating it lazily outside the app lifespan"""
+    global parse_pool
+
+    if parse_pool is None:
+        parse_pool = _build_parse_pool()
+
+    return parse_pool
 
 
 async def scrape_url(url: str) -> dict:
@@ -13,35 +80,55 @@ async def scrape_url(url: str) -> dict:
     Returns:
         Dictionary containing url, title, content, and success status
     """
+    start = time.perf_counter()
+    result = await _scrape_url(url)
+    
+    outcome = "error" if not result["success"] else "cached" if result.get("cached") else "ok"
+    SCRAPE_SECONDS.labels(outcome).observe(time.perf_counter() - start)
+    return result
+
+
+async def _scrape_url(url: str) -> dict:
     try:
         logger.info(f"Scraping URL: {url}")
         
-        # Fetch the URL with timeout
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, follow_redirects=True)
-            response.raise_for_status()
-            html = response.text
-        
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Serve fresh cache entries without touching the network
+        cache = get_scrape_cache()
+        cached = await cache.get(url) if cache else None
+        if cached and cached["fresh"]:
+            logger.info(f"Scrape cache hit for {url}")
+            return _cached_result(url, cached)
         
-        # Remove unwanted tags
-        for tag in soup.find_all(['script', 'style', 'nav', 'footer', 'aside']):
-            tag.decompose()
+        # Revalidate stale entries with a conditional request
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
         
-        # Extract title
-        title_tag = soup.find('title')
-        title = title_tag.get_text(strip=True) if title_tag else "No title"
-        
-        # Extract body text
-        body_text = soup.get_text(separator=' ', strip=True)
+        # Stream the URL over the shared connection pool, reading only what we need
+        client = get_http_client()
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                logger.info(f"Scrape cache revalidated for {url}")
+                await cache.touch(url)
+                return _cached_result(url, cached)
+            
+            response.raise_for_status()
+            _check_content_type(response)
+            html = await _read_html(response)
         
-        # Clean text: remove extra whitespace
-        content = ' '.join(body_text.split())
+        title, content = await _extract_content(html)
         
-        # Limit to 5000 characters
-        if len(content) > 5000:
-            content = content[:5000] + "..."
+        if cache:
+            await cache.put(
+                url,
+                title,
+                content,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
         
         logger.info(f"Successfully scraped {url} - {len(content)} characters")
         
@@ -52,6 +139,14 @@ async def scrape_url(url: str) -> dict:
             "success": True
         }
         
+    except UnsupportedContentError as e:
+        logger.warning(f"Skipping {url}: {e}")
+        return {
+            "url": url,
+            "success": False,
+            "error": str(e)
+        }
+        
     except httpx.TimeoutException as e:
         logger.error(f"Timeout while scraping {url}: {e}")
         return {
@@ -83,3 +178,194 @@ async def scrape_url(url: str) -> dict:
             "success": False,
             "error": str(e)
         }
+
+
+def _check_content_type(response: httpx.Response):
+    """
+    Reject responses that are not HTML or text before the body is downloaded.
+    
+    Raises:
+        UnsupportedContentError: If the Content-Type is not allowed
+    """
+    content_type = response.headers.get("content-type", "")
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type and media_type not in settings.SCRAPE_ALLOWED_CONTENT_TYPES:
+        raise UnsupportedContentError(f"Unsupported content type: {media_type}")
+
+
+async def _read_html(response: httpx.Response) -> str:
+    """
+    Read a streamed response body under a byte budget.
+    
+    Stops at SCRAPE_MAX_BYTES, or earlier once the page holds enough visible
+    text to fill SCRAPE_MAX_CONTENT_CHARS with headroom for boilerplate.
+    
+    Args:
+        response: An open streaming response
+        
+    Returns:
+        The (possibly truncated) decoded document
+    """
+    max_bytes = settings.SCRAPE_MAX_BYTES
+    text_target = settings.SCRAPE_MAX_CONTENT_CHARS * settings.SCRAPE_TEXT_HEADROOM
+    
+    try:
+        decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    
+    parts = []
+    bytes_read = 0
+    next_check = _MIN_TEXT_CHECK_BYTES
+    
+    async for chunk in response.aiter_bytes():
+        remaining = max_bytes - bytes_read
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+        bytes_read += len(chunk)
+        SCRAPE_BYTES.inc(len(chunk))
+        parts.append(decoder.decode(chunk))
+        
+        if bytes_read >= max_bytes:
+            logger.info(f"Byte budget reached for {response.url} after {bytes_read} bytes")
+            break
+        
+        # Check the text estimate at geometrically growing offsets so the total
+        # regex work stays linear in the bytes read
+        if bytes_read >= next_check:
+            html = "".join(parts)
+            parts = [html]
+            if _estimate_text_length(html) >= text_target:
+                logger.info(f"Enough text extracted from {response.url} after {bytes_read} bytes")
+                break
+            next_check = max(bytes_read + _MIN_TEXT_CHECK_BYTES, int(bytes_read * 1.5))
+    
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def _estimate_text_length(html: str) -> int:
+    """Cheaply estimate the visible text length of an HTML fragment"""
+    return len(" ".join(_NON_TEXT_RE.sub(" ", html).split()))
+
+
+async def _extract_content(html: str) -> Tuple[str, str]:
+    """
+    Extract the title and clean text of an HTML document in the parse pool.
+    
+    Parsing is CPU-bound, so it runs in a dedicated worker pool instead of
+    on the event loop that serves the API.
+    
+    Args:
+        html: Raw HTML
+        
+    Returns:
+        Tuple of (title, content) with content limited to SCRAPE_MAX_CONTENT_CHARS
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_parse_pool(),
+        extract,
+        html,
+        settings.SCRAPER_EXTRACTOR,
+        settings.SCRAPER_MAIN_CONTENT,
+        settings.SCRAPE_MAX_CONTENT_CHARS,
+    )
+
+
+def _cached_result(url: str, cached: dict) -> dict:
+    """Build a scrape result from a cache entry"""
+    return {
+        "url": url,
+        "title": cached["title"],
+        "content": cached["content"],
+        "success": True,
+        "cached": True
+    }
+
+
+async def scrape_urls(
+    urls: List[str],
+    snippets: Optional[Dict[str, dict]] = None,
+    concurrency: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[dict]:
+    """
+    Scrape several URLs concurrently under a global and per-host cap.
+    
+    URLs that have not finished when the stage deadline expires are cancelled
+    and replaced by their search snippet, so one slow host cannot hold up the
+    whole researcher stage. If the caller is cancelled, in-flight scrapes are
+    cancelled with it.
+    
+    Args:
+        urls: The URLs to scrape
+        snippets: Optional mapping of url to search result used as fallback
+        concurrency: Maximum scrapes in flight (default: SCRAPE_CONCURRENCY)
+        per_host_limit: Maximum scrapes in flight per host (default: SCRAPE_PER_HOST_LIMIT)
+        timeout: Overall stage deadline in seconds (default: SCRAPE_STAGE_TIMEOUT)
+        
+    Returns:
+        List of scrape result dictionaries in the same order as urls
+    """
+    if not urls:
+        return []
+    
+    snippets = snippets or {}
+    concurrency = concurrency or settings.SCRAPE_CONCURRENCY
+    per_host_limit = per_host_limit or settings.SCRAPE_PER_HOST_LIMIT
+    timeout = timeout if timeout is not None else settings.SCRAPE_STAGE_TIMEOUT
+    
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+    
+    async def _bounded_scrape(url: str) -> dict:
+        host = urlsplit(url).hostname or ""
+        host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host_limit))
+        async with host_limit:
+            async with global_limit:
+                return await scrape_url(url)
+    
+    tasks = [asyncio.create_task(_bounded_scrape(url)) for url in urls]
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+    finally:
+        # Also runs when the caller is cancelled (node timeout, session deadline)
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
+    
+    if pending:
+        logger.warning(f"Scrape deadline of {timeout}s reached, dropped {len(pending)} of {len(urls)} URLs")
+    
+    results = []
+    for url, task in zip(urls, tasks):
+        if task in done and not task.cancelled() and task.exception() is None:
+            results.append(task.result())
+        else:
+            results.append(_snippet_result(url, snippets.get(url)))
+    
+    return results
+
+
+def _snippet_result(url: str, search_result: Optional[dict]) -> dict:
+    """
+    Build a scrape result from a search snippet for a URL that missed the deadline.
+    """
+    if not search_result or not search_result.get("snippet"):
+        return {
+            "url": url,
+            "success": False,
+            "error": "Scrape deadline exceeded"
+        }
+    
+    return {
+        "url": url,
+        "title": search_result.get("title") or "No title",
+        "content": search_result["snippet"],
+        "success": True,
+        "from_snippet": True
+    }
@@ -1,67 +1,291 @@
-from typing import List
-from tavily import TavilyClient
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from duckduckgo_search import DDGS
 from app.config import settings
+from app.tools.http_client import get_http_client
+from app.utils.cache import AsyncTTLCache
+from app.utils.helpers import normalize_query, normalize_url
 from app.utils.logger import logger
+from app.utils.metrics import SEARCH_PROVIDER_SECONDS, SEARCH_SECONDS
 
+# Global variables
+search_providers = None
+search_cache = AsyncTTLCache(settings.SEARCH_CACHE_MAX_ENTRIES, settings.SEARCH_CACHE_TTL)
 
-async def search_web(query: str, max_results: int = 10) -> List[dict]:
+# The DuckDuckGo client is sync-only; keep its calls off the event loop and out of the default executor
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")
+
+
+class SearchProvider(ABC):
+    """Base class for web search providers; records latency and success rate"""
+
+    name = "provider"
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.empties = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+
+    @abstractmethod
+    async def search(self, query: str, max_results: int) -> List[dict]:
+        """Run one search, raising on errors"""
+
+    async def timed_search(self, query: str, max_results: int, timeout: float) -> List[dict]:
+        """Run a search under a deadline, recording the outcome; never raises"""
+        self.calls += 1
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            results = await asyncio.wait_for(self.search(query, max_results), timeout=timeout)
+            if results:
+                self.successes += 1
+                outcome = "ok"
+            else:
+                # The provider answered; it just had nothing for this query
+                self.empties += 1
+                outcome = "empty"
+            logger.info(f"Found {len(results)} results from {self.name}")
+            return results
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            outcome = "timeout"
+            logger.warning(f"{self.name} search timed out after {timeout}s")
+            return []
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"{self.name} search failed: {e}")
+            return []
+        finally:
+            elapsed = time.perf_counter() - start
+            self.total_latency += elapsed
+            SEARCH_PROVIDER_SECONDS.labels(self.name, outcome).observe(elapsed)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "empties": self.empties,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "success_rate": self.successes / self.calls if self.calls else 0.0,
+            "mean_latency_seconds": self.total_latency / self.calls if self.calls else 0.0,
+        }
+
+
+class TavilyProvider(SearchProvider):
+    """Tavily search over the shared async HTTP client"""
+
+    name = "tavily"
+
+    def __init__(self, api_key: str, api_url: str):
+        super().__init__()
+        self.api_key = api_key
+        self.api_url = api_url
+
+    async def search(self, query: str, max_results: int) -> List[dict]:
+        logger.info(f"Searching with Tavily: {query}")
+        response = await get_http_client().post(
+            self.api_url,
+            json={"api_key": self.api_key, "query": query, "max_results": max_results},
+        )
+        response.raise_for_status()
+
+        return [
+            {
+                "url": result.get("url", ""),
+                "title": result.get("title", ""),
+                "snippet": result.get("content", ""),
+                "source": "tavily"
+            }
+            for result in response.json().get("results", [])
+        ]
+
+
+class DuckDuckGoProvider(SearchProvider):
+    """DuckDuckGo search; the sync client runs in the search thread pool"""
+
+    name = "duckduckgo"
+
+    @staticmethod
+    def _text_search(query: str, max_results: int) -> List[dict]:
+        # DDGS keeps per-session state and is not thread-safe; use one per call
+        return DDGS().text(query, max_results=max_results)
+
+    async def search(self, query: str, max_results: int) -> List[dict]:
+        logger.info(f"Searching with DuckDuckGo: {query}")
+        loop = asyncio.get_running_loop()
+        ddgs_results = await loop.run_in_executor(_search_executor, self._text_search, query, max_results)
+
+        return [
+            {
+                "url": result.get("href", result.get("link", "")),
+                "title": result.get("title", ""),
+                "snippet": result.get("body", result.get("snippet", "")),
+                "source": "duckduckgo"
+            }
+            for result in ddgs_results or []
+        ]
+
+
+def get_search_providers() -> List[SearchProvider]:
+    """Get the configured providers in priority order, constructing them once"""
+    global search_providers
+
+    if search_providers is None:
+        search_providers = []
+        for name in settings.SEARCH_PROVIDERS:
+            if name == "tavily":
+                if settings.TAVILY_API_KEY:
+                    search_providers.append(TavilyProvider(settings.TAVILY_API_KEY, settings.TAVILY_API_URL))
+                else:
+                    logger.warning("TAVILY_API_KEY not set, skipping Tavily")
+            elif name == "duckduckgo":
+                search_providers.append(DuckDuckGoProvider())
+            else:
+                logger.warning(f"Unknown search provider: {name}")
+
+    return search_providers
+
+
+def get_provider_stats() -> Dict[str, dict]:
+    """Per-provider call counts, success rate and mean latency"""
+    return {provider.name: provider.stats() for provider in search_providers or []}
+
+
+async def search_web(query: str, max_results: int = 10, strategy: Optional[str] = None) -> List[dict]:
     """
-    Search the web using Tavily API with DuckDuckGo as fallback.
+    Search the web, serving repeated queries from the search cache.
+    
+    The cache key is the normalized query (case, whitespace and trailing
+    punctuation folded), max_results, the provider list and the strategy. Concurrent
+    identical searches share a single upstream call. Empty results are not
+    cached.
     
     Args:
         query: Search query string
         max_results: Maximum number of results to return
+        strategy: Override SEARCH_STRATEGY for this call
         
     Returns:
         List of search result dictionaries with url, title, snippet, and source
     """
-    
-    # Try Tavily API first
-    try:
-        if settings.TAVILY_API_KEY:
-            logger.info(f"Searching with Tavily: {query}")
-            client = TavilyClient(api_key=settings.TAVILY_API_KEY)
-            response = client.search(query, max_results=max_results)
-            
-            results = []
-            for result in response.get("results", []):
-                results.append({
-                    "url": result.get("url", ""),
-                    "title": result.get("title", ""),
-                    "snippet": result.get("content", ""),
-                    "source": "tavily"
-                })
-            
-            if results:
-                logger.info(f"Found {len(results)} results from Tavily")
-                return results
-            else:
-                logger.warning("Tavily returned no results, falling back to DuckDuckGo")
-        else:
-            logger.warning("TAVILY_API_KEY not set, using DuckDuckGo fallback")
-            
-    except Exception as e:
-        logger.error(f"Tavily search failed: {e}, falling back to DuckDuckGo")
-    
-    # Fallback to DuckDuckGo
-    try:
-        logger.info(f"Searching with DuckDuckGo: {query}")
-        ddgs = DDGS()
-        ddgs_results = ddgs.text(query, max_results=max_results)
-        
-        results = []
-        for result in ddgs_results:
-            results.append({
-                "url": result.get("href", result.get("link", "")),
-                "title": result.get("title", ""),
-                "snippet": result.get("body", result.get("snippet", "")),
-                "source": "duckduckgo"
-            })
+    strategy = strategy or settings.SEARCH_STRATEGY
+    with SEARCH_SECONDS.time():
+        if not settings.SEARCH_CACHE_ENABLED:
+            return await _search_providers(query, max_results, strategy)
         
-        logger.info(f"Found {len(results)} results from DuckDuckGo")
-        return results
+        providers = ",".join(provider.name for provider in get_search_providers())
+        key = (normalize_query(query), max_results, providers, strategy)
         
-    except Exception as e:
-        logger.error(f"DuckDuckGo search failed: {e}")
+        results = await search_cache.get_or_load(
+            key,
+            lambda: _search_providers(query, max_results, strategy),
+            should_cache=bool,
+        )
+        # Callers may mutate the list; keep the cached copy intact
+        return [dict(result) for result in results]
+
+
+async def _search_providers(query: str, max_results: int, strategy: str) -> List[dict]:
+    """
+    Search the web across the configured providers.
+
+    Strategies:
+        fallback: try providers one at a time in priority order
+        hedge: start the next provider if the current one has not answered
+            within SEARCH_HEDGE_DELAY, or as soon as it fails
+        race: start every provider at once
+        merge: start every provider at once and wait for all of them
+
+    Each provider runs under SEARCH_PROVIDER_TIMEOUT. Once one provider has
+    results, others still in flight get SEARCH_MERGE_GRACE seconds to finish
+    (except in merge mode, where all are awaited). Finished result lists are
+    merged in priority order and deduplicated by normalized URL.
+
+    Args:
+        query: Search query string
+        max_results: Maximum number of results to return
+        strategy: Provider strategy
+
+    Returns:
+        List of search result dictionaries with url, title, snippet, and source
+    """
+    providers = get_search_providers()
+    if not providers:
+        logger.error("No search providers configured")
         return []
+
+    timeout = settings.SEARCH_PROVIDER_TIMEOUT
+
+    tasks: Dict[asyncio.Task, SearchProvider] = {}
+    results: Dict[str, List[dict]] = {}
+    waiting = list(providers)
+
+    def launch_next():
+        provider = waiting.pop(0)
+        task = asyncio.create_task(provider.timed_search(query, max_results, timeout))
+        tasks[task] = provider
+
+    launch_next()
+    if strategy in ("race", "merge"):
+        while waiting:
+            launch_next()
+
+    pending = set(tasks)
+    try:
+        while pending:
+            hedge_timeout = settings.SEARCH_HEDGE_DELAY if strategy == "hedge" and waiting else None
+            done, pending = await asyncio.wait(pending, timeout=hedge_timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # Current provider is slow: hedge with the next one
+                logger.info(f"Hedging search with {waiting[0].name}")
+                launch_next()
+                pending = {task for task in tasks if not task.done()}
+                continue
+
+            for task in done:
+                results[tasks[task].name] = task.result()
+
+            if any(results.values()) and strategy != "merge":
+                break
+
+            # Nothing usable yet: move on to the next provider right away
+            if waiting and strategy in ("fallback", "hedge"):
+                logger.warning(f"Falling back to {waiting[0].name}")
+                launch_next()
+                pending = {task for task in tasks if not task.done()}
+
+        if pending and strategy != "merge":
+            done, pending = await asyncio.wait(pending, timeout=settings.SEARCH_MERGE_GRACE)
+            for task in done:
+                results[tasks[task].name] = task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return merge_results([results.get(provider.name, []) for provider in providers], max_results)
+
+
+def merge_results(result_lists: List[List[dict]], max_results: int) -> List[dict]:
+    """Merge result lists in priority order, dropping duplicate URLs"""
+    merged = []
+    seen = set()
+    for result_list in result_lists:
+        for result in result_list:
+            if not result.get("url"):
+                continue
+            key = normalize_url(result["url"])
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(result)
+
+    return merged[:max_results]
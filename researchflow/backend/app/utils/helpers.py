@@ -1,5 +1,50 @@
 # Helper functions
+import re
 import uuid
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track the visitor and never change page content
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref_src"}
+
+_TRAILING_PUNCTUATION_RE = re.compile(r"[.?!,;:]+$")
 
 def generate_id():
     return str(uuid.uuid4())
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent spellings map to the same key.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, sorts the query string and strips a trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize free text so queries differing only in case, whitespace or
+    trailing sentence punctuation compare equal.
+
+    Punctuation inside the text is kept: "C++", "C#" and "C" are different
+    topics, as are "node.js" and "node js".
+    """
+    return _TRAILING_PUNCTUATION_RE.sub("", " ".join(text.lower().split())).rstrip()
@@ -0,0 +1,30 @@
+import logging
+import sys
+from app.config import settings
+
+
+def setup_logger(name: str = "researchflow") -> logging.Logger:
+    """
+    Create the application logger.
+
+    Logs go to stdout at LOG_LEVEL with a timestamp, level and logger name.
+    Calling this again returns the same logger without adding handlers.
+
+    Args:
+        name: Logger name
+
+    Returns:
+        Configured logger
+    """
+    log = logging.getLogger(name)
+    if not log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+        log.addHandler(handler)
+        log.propagate = False
+
+    log.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+    return log
+
+
+logger = setup_logger()
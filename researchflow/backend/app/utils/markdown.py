@@ -0,0 +1,69 @@
+import re
+from typing import List
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+def split_sections(markdown: str, max_level: int = 2) -> List[dict]:
+    """
+    Split a markdown document at its headings.
+
+    Headings deeper than `max_level` stay inside their parent section, and
+    lines inside fenced code blocks are never treated as headings. Text before
+    the first heading becomes a section with an empty heading.
+
+    Args:
+        markdown: Markdown document
+        max_level: Deepest heading level that starts a new section
+
+    Returns:
+        List of dicts with heading (the heading line), title, level (0 for
+        the preamble) and body, in document order
+    """
+    sections = []
+    current = {"heading": "", "title": "", "level": 0, "lines": []}
+    in_fence = False
+
+    for line in markdown.splitlines():
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING_RE.match(line)
+
+        if match and len(match.group(1)) <= max_level:
+            sections.append(current)
+            current = {"heading": line.strip(), "title": match.group(2), "level": len(match.group(1)), "lines": []}
+        else:
+            current["lines"].append(line)
+
+    sections.append(current)
+
+    result = []
+    for section in sections:
+        body = "\n".join(section.pop("lines")).strip("\n")
+        if section["heading"] or body.strip():
+            result.append({**section, "body": body})
+    return result
+
+
+def section_text(section: dict) -> str:
+    """Render a section back to markdown"""
+    if not section["heading"]:
+        return section["body"]
+    if not section["body"]:
+        return section["heading"]
+    return f"{section['heading']}\n\n{section['body']}"
+
+
+def join_sections(sections: List[dict]) -> str:
+    """Reassemble sections produced by split_sections"""
+    return "\n\n".join(section_text(section) for section in sections)
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove a fence wrapping an entire LLM response (```markdown ... ```)"""
+    stripped = text.strip()
+    lines = stripped.splitlines()
+    if len(lines) >= 2 and _FENCE_RE.match(lines[0]) and lines[-1].strip() in ("```", "~~~"):
+        return "\n".join(lines[1:-1]).strip("\n")
+    return stripped
@@ -0,0 +1,126 @@
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+# Latency buckets (seconds) for network calls and for whole workflow nodes
+CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+NODE_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 40, 60, 120, 300, 600)
+
+SEARCH_SECONDS = Histogram(
+    "researchflow_search_seconds", "search_web latency, including cache hits", buckets=CALL_BUCKETS,
+)
+SEARCH_PROVIDER_SECONDS = Histogram(
+    "researchflow_search_provider_seconds", "Latency of one search provider call",
+    ["provider", "outcome"], buckets=CALL_BUCKETS,
+)
+
+SCRAPE_SECONDS = Histogram(
+    "researchflow_scrape_seconds", "scrape_url latency by outcome (ok, cached, error)",
+    ["outcome"], buckets=CALL_BUCKETS,
+)
+SCRAPE_BYTES = Counter("researchflow_scrape_bytes", "Response bytes read while scraping")
+
+LLM_SECONDS = Histogram(
+    "researchflow_llm_seconds", "LLM call latency, from acquiring a slot to the last token",
+    ["model", "outcome"], buckets=CALL_BUCKETS,
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "researchflow_llm_first_token_seconds", "Time to the first streamed token",
+    ["model"], buckets=CALL_BUCKETS,
+)
+LLM_SLOT_WAIT_SECONDS = Histogram(
+    "researchflow_llm_slot_wait_seconds", "Time waiting for LLM rate-limit quota and an in-flight slot",
+    buckets=CALL_BUCKETS,
+)
+LLM_TOKENS = Counter("researchflow_llm_tokens", "LLM tokens by kind (prompt, completion)", ["model", "kind"])
+LLM_RETRIES = Counter(
+    "researchflow_llm_retries", "LLM attempts retried, by reason (rate_limited, server_error, connection)",
+    ["model", "reason"],
+)
+LLM_FALLBACKS = Counter("researchflow_llm_fallbacks", "LLM calls moved to a fallback model", ["model"])
+LLM_HEDGES = Counter("researchflow_llm_hedges", "Hedged LLM requests by outcome (sent, won)", ["outcome"])
+LLM_CIRCUIT_OPEN = Gauge("researchflow_llm_circuit_open", "1 while a model's circuit breaker is not closed", ["model"])
+
+NODE_SECONDS = Histogram(
+    "researchflow_node_seconds", "Wall time of a workflow node run",
+    ["node", "status"], buckets=NODE_BUCKETS,
+)
+NODE_QUEUE_SECONDS = Histogram(
+    "researchflow_node_queue_seconds", "Time a workflow node waited between becoming runnable and starting",
+    ["node"], buckets=CALL_BUCKETS,
+)
+SESSIONS_IN_FLIGHT = Gauge("researchflow_sessions_in_flight", "Workflows running in this process")
+JOB_RETRIES = Counter("researchflow_job_retries", "Jobs reclaimed after their lease lapsed")
+
+QUEUE_JOBS = Gauge("researchflow_queue_jobs", "Jobs in the durable queue by status", ["status"])
+QUEUE_OLDEST_WAIT = Gauge("researchflow_queue_oldest_wait_seconds", "Age of the oldest queued job")
+
+
+class StatsCollector:
+    """
+    Export the counters kept by caches and the quality gate at scrape time.
+
+    Those components keep their own plain-dict stats (also served as JSON);
+    this collector reads them on each scrape instead of duplicating counters.
+    """
+
+    def describe(self):
+        # Metric names are only known once the sources are imported; skip the
+        # registration-time collect so this module can be imported by them
+        return []
+
+    def collect(self):
+        from app.agents.quality import get_quality_stats
+        from app.tools.llm_cache import get_llm_cache
+        from app.tools.scrape_cache import get_scrape_cache
+        from app.tools.web_search import search_cache
+
+        lookups = CounterMetricFamily("researchflow_cache_lookups", "Cache lookups by result", labels=["cache", "result"])
+        ratio = GaugeMetricFamily("researchflow_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+
+        caches = {"search": search_cache.stats()}
+        scrape_cache = get_scrape_cache()
+        if scrape_cache is not None:
+            caches["scrape"] = scrape_cache.stats()
+        llm_cache = get_llm_cache()
+        if llm_cache is not None:
+            caches["llm"] = llm_cache.stats()
+
+        for name, stats in caches.items():
+            for result in ("hits", "misses", "coalesced", "revalidations"):
+                if result in stats:
+                    lookups.add_metric([name, result], stats[result])
+            ratio.add_metric([name], stats["hit_ratio"])
+        yield lookups
+        yield ratio
+
+        quality = get_quality_stats()
+        drafts = CounterMetricFamily("researchflow_drafts_scored", "Drafts scored by the quality gate", labels=["result"])
+        drafts.add_metric(["passed"], quality["drafts_scored"] - quality["drafts_failed"])
+        drafts.add_metric(["failed"], quality["drafts_failed"])
+        yield drafts
+
+        rewrites = CounterMetricFamily("researchflow_draft_rewrites", "Targeted draft rewrites")
+        rewrites.add_metric([], quality["rewrites"])
+        yield rewrites
+
+        rewrite_seconds = CounterMetricFamily("researchflow_draft_rewrite_seconds", "Time spent in draft rewrites")
+        rewrite_seconds.add_metric([], quality["rewrite_seconds"])
+        yield rewrite_seconds
+
+
+REGISTRY.register(StatsCollector())
+
+
+async def render_metrics() -> bytes:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Queue depth lives in Mongo, so it is read here rather than tracked.
+    """
+    from app.workflow.queue import queue_stats
+
+    stats = await queue_stats()
+    QUEUE_JOBS.labels("queued").set(stats["queued"])
+    QUEUE_JOBS.labels("running").set(stats["running"])
+    QUEUE_OLDEST_WAIT.set(stats["oldest_wait_seconds"])
+    return generate_latest(REGISTRY)
@@ -0,0 +1,188 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional, Set
+from app.utils.logger import logger
+
+
+class SessionBroker:
+    """
+    In-process publish/subscribe for research session events.
+
+    Each session is a channel. Events are kept in a per-session history, so a
+    subscriber that joins late first receives everything published so far and
+    then follows the live stream. Consecutive text deltas (TEXT_EVENTS) are
+    merged in the history, so a late subscriber replays a streamed draft as
+    one event and status transitions are never crowded out by token noise.
+    Closing a channel ends every subscription and drops the history after
+    `retain_seconds`.
+    """
+
+    # Events whose data is {"text": delta}; a run of them is replayed as one event
+    TEXT_EVENTS = {"draft", "report"}
+
+    def __init__(self, queue_size: int = 10000, retain_seconds: float = 60.0):
+        self.queue_size = queue_size
+        self.retain_seconds = retain_seconds
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # Per session: [event, data] entries; a merged text run keeps its deltas in a list
+        self._history: Dict[str, List[list]] = {}
+        self._closed: Set[str] = set()
+        self._aliases: Dict[str, str] = {}
+
+    def alias(self, session_id: str, target_id: str):
+        """Route subscriptions for session_id to the channel of target_id"""
+        self._aliases[session_id] = self._resolve(target_id)
+
+    def _resolve(self, session_id: str) -> str:
+        return self._aliases.get(session_id, session_id)
+
+    def publish(self, session_id: str, event: str, data: Optional[dict] = None):
+        """Publish an event to every subscriber of a session"""
+        message = {"event": event, "data": data or {}}
+        history = self._history.setdefault(session_id, [])
+        if event in self.TEXT_EVENTS:
+            if history and history[-1][0] == event and isinstance(history[-1][1], list):
+                history[-1][1].append(message["data"].get("text", ""))
+            else:
+                history.append([event, [message["data"].get("text", "")]])
+        else:
+            history.append([event, message["data"]])
+
+        for queue in list(self._subscribers.get(session_id, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A consumer this far behind is gone or stuck; end its stream
+                logger.warning(f"Dropping slow subscriber on session {session_id}")
+                self._subscribers[session_id].discard(queue)
+                self._end(queue)
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        """
+        Subscribe to a session channel.
+
+        Returns:
+            Queue yielding event dicts, then None once the channel is closed
+        """
+        session_id = self._resolve(session_id)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        for event, data in self._history.get(session_id, [])[-self.queue_size:]:
+            if isinstance(data, list):
+                data = {"text": "".join(data)}
+            queue.put_nowait({"event": event, "data": data})
+
+        if session_id in self._closed:
+            self._end(queue)
+        else:
+            self._subscribers.setdefault(session_id, set()).add(queue)
+
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue):
+        session_id = self._resolve(session_id)
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[session_id]
+
+    def is_active(self, session_id: str) -> bool:
+        """Whether this process has seen events for a session"""
+        return self._resolve(session_id) in self._history
+
+    def close(self, session_id: str):
+        """End a session channel and forget its history after a grace period"""
+        if session_id in self._closed:
+            return
+        self._closed.add(session_id)
+
+        for queue in self._subscribers.pop(session_id, set()):
+            self._end(queue)
+
+        try:
+            asyncio.get_running_loop().call_later(self.retain_seconds, self._forget, session_id)
+        except RuntimeError:
+            self._forget(session_id)
+
+    def reopen(self, session_id: str):
+        """Start a fresh channel for a session that runs again (e.g. on resume)"""
+        self._forget(session_id)
+
+    def _forget(self, session_id: str):
+        self._history.pop(session_id, None)
+        self._closed.discard(session_id)
+        self._aliases.pop(session_id, None)
+        for alias in [alias for alias, target in self._aliases.items() if target == session_id]:
+            del self._aliases[alias]
+
+    @staticmethod
+    def _end(queue: asyncio.Queue):
+        try:
+            queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # Make room for the end-of-stream marker
+            queue.get_nowait()
+            queue.put_nowait(None)
+
+
+broker = SessionBroker()
+
+
+def publish_status(
+    session_id: str,
+    status: str,
+    progress: Optional[int] = None,
+    current_agent: Optional[str] = None,
+    report_id: Optional[str] = None,
+    error_message: Optional[str] = None,
+):
+    """Publish a session status transition; omitted fields keep their last value"""
+    data = {"session_id": session_id, "status": status}
+    if progress is not None:
+        data["progress"] = progress
+    if current_agent is not None:
+        data["current_agent"] = current_agent
+    if report_id is not None:
+        data["report_id"] = report_id
+    if error_message is not None:
+        data["error_message"] = error_message
+    broker.publish(session_id, "status", data)
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_events(
+    queue: asyncio.Queue,
+    session_id: str,
+    events: Optional[Set[str]] = None,
+    keepalive: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    Turn a broker subscription into server-sent events.
+
+    Args:
+        queue: Queue returned by broker.subscribe()
+        session_id: Channel the queue is subscribed to
+        events: Event names to forward (default: all)
+        keepalive: Seconds of silence before a keepalive comment is sent
+
+    Yields:
+        SSE-formatted strings until the channel closes or the client leaves
+    """
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if message is None:
+                return
+            if events is None or message["event"] in events:
+                yield format_sse(message["event"], message["data"])
+    finally:
+        broker.unsubscribe(session_id, queue)
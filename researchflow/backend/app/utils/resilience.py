@@ -0,0 +1,169 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `per_minute` tokens a minute.
+
+    `acquire` waits until the requested amount is available. The level can
+    be lowered from outside (server-reported remaining quota, or a 429) so the
+    bucket follows the provider's view of the limit rather than only its own.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take `amount` tokens, waiting for them if needed.
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # One waiter at a time keeps large requests from being starved by small ones
+        async with self._lock:
+            while True:
+                self._refill()
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                else:
+                    delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def refund(self, amount: float):
+        """Return tokens taken for an estimate that turned out too high"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def limit_to(self, remaining: float):
+        """Lower the level to a remaining quota reported by the server"""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+    def blocked_for(self) -> float:
+        """Seconds until the bucket grants anything again because of block_for"""
+        return max(self.blocked_until - time.monotonic(), 0.0)
+
+    def block_for(self, seconds: float):
+        """Grant nothing for `seconds` (the server said to back off)"""
+        self._refill()
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    `allow` returns False for `reset_seconds`. It then lets a single trial
+    call through (half-open); success closes it, failure opens it again. A
+    trial that never reports back (cancelled) is given up on after another
+    `reset_seconds`.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        now = time.monotonic()
+        if state == "half_open" and (self.trial_started is None or now - self.trial_started >= self.reset_seconds):
+            self.trial_started = now
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started = None
+
+    def release(self):
+        """End a half-open trial without a verdict, letting the next call try"""
+        self.trial_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_started = None
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before retry number `attempt` (0-based).
+
+    Full-jitter exponential backoff: a random delay up to base * 2**attempt,
+    capped at `cap`. A server-provided Retry-After is treated as a floor.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP dates are ignored)"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse durations like "7.66s", "2m59.56s" or "120ms" into seconds"""
+    if not value:
+        return None
+    total, number = 0.0, ""
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    i = 0
+    try:
+        while i < len(value):
+            char = value[i]
+            if char.isdigit() or char == ".":
+                number += char
+                i += 1
+                continue
+            unit = "ms" if value.startswith("ms", i) else char
+            total += float(number) * units[unit]
+            number = ""
+            i += len(unit)
+        return total + (float(number) if number else 0.0)
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+from app.agents.state import AgentState
+from app.models.research import WorkflowCheckpoint
+from app.utils.logger import logger
+
+# State fields each node produces, in workflow order
+NODE_OUTPUTS = {
+    "researcher": ["search_results", "scraped_content"],
+    "writer": ["draft_report", "retry_count"],
+}
+
+
+async def save_checkpoint(state: AgentState, node: str):
+    """
+    Persist a node's output so the session can resume after it.
+
+    Args:
+        state: Current AgentState after the node succeeded
+        node: Name of the completed node (a key of NODE_OUTPUTS)
+    """
+    fields = {field: state.get(field) for field in NODE_OUTPUTS[node]}
+    fields["updated_at"] = datetime.now(timezone.utc)
+
+    try:
+        await WorkflowCheckpoint.get_motor_collection().update_one(
+            {"session_id": state["session_id"]},
+            {"$set": fields, "$addToSet": {"completed_nodes": node}},
+            upsert=True,
+        )
+        state["completed_nodes"] = sorted(set(state.get("completed_nodes", [])) | {node})
+        logger.info(f"Checkpointed {node} output for session {state['session_id']}")
+    except Exception as e:
+        # A missing checkpoint only costs rework on resume; never fail the node
+        logger.error(f"Failed to checkpoint {node} for session {state['session_id']}: {e}")
+
+
+async def reopen_checkpoint(state: AgentState, node: str):
+    """Mark a node as needing to run again (e.g. the editor asked for a rewrite)"""
+    if node in state.get("completed_nodes", []):
+        state["completed_nodes"].remove(node)
+
+    try:
+        await WorkflowCheckpoint.get_motor_collection().update_one(
+            {"session_id": state["session_id"]},
+            {
+                "$pull": {"completed_nodes": node},
+                "$set": {"retry_count": state.get("retry_count", 0), "updated_at": datetime.now(timezone.utc)},
+            },
+        )
+    except Exception as e:
+        logger.error(f"Failed to reopen {node} checkpoint for session {state['session_id']}: {e}")
+
+
+async def restore_checkpoint(state: AgentState) -> AgentState:
+    """
+    Load the last checkpoint of a session into the state.
+
+    Args:
+        state: Initial AgentState of the session
+
+    Returns:
+        The state with checkpointed outputs and completed_nodes filled in
+    """
+    checkpoint = await WorkflowCheckpoint.find_one(WorkflowCheckpoint.session_id == state["session_id"])
+    if checkpoint is None:
+        state["completed_nodes"] = []
+        return state
+
+    for node in checkpoint.completed_nodes:
+        for field in NODE_OUTPUTS.get(node, []):
+            state[field] = getattr(checkpoint, field)
+    state["completed_nodes"] = list(checkpoint.completed_nodes)
+
+    logger.info(f"Restored checkpoint for session {state['session_id']}: completed {state['completed_nodes']}")
+    return state
+
+
+async def clear_checkpoint(session_id: str):
+    """Delete a session's checkpoint once its report is stored"""
+    try:
+        await WorkflowCheckpoint.find_one(WorkflowCheckpoint.session_id == session_id).delete()
+    except Exception as e:
+        logger.error(f"Failed to clear checkpoint for session {session_id}: {e}")
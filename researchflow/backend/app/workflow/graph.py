@@ -0,0 +1,228 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from langgraph.graph import END, StateGraph
+from app.agents.editor import editor_node
+from app.agents.researcher import researcher_node
+from app.agents.state import AgentState
+from app.agents.writer import writer_node
+from app.config import settings
+from app.models.research import ResearchSession
+from app.tools.llm import llm_deadline, llm_slot_waits
+from app.utils.logger import logger
+from app.utils.metrics import NODE_QUEUE_SECONDS, NODE_SECONDS, SESSIONS_IN_FLIGHT
+from app.utils.pubsub import broker
+from app.workflow.checkpoint import restore_checkpoint
+from app.workflow.progress import SessionProgress, fail_session
+
+# Global variables
+research_workflow = None
+
+NodeFunction = Callable[[AgentState], Awaitable[AgentState]]
+
+
+def _node_timeouts() -> dict:
+    return {
+        "researcher": settings.RESEARCHER_TIMEOUT,
+        "writer": settings.WRITER_TIMEOUT,
+        "editor": settings.EDITOR_TIMEOUT,
+    }
+
+
+def timed_node(name: str, node: NodeFunction) -> NodeFunction:
+    """
+    Wrap a workflow node with a timeout and timing record.
+
+    The node runs under the smaller of its own timeout and the time left
+    before the session deadline (state["deadline"], a time.monotonic()
+    value). Every run appends a record to the session's `timings`:
+    queue_seconds from the node becoming runnable (the previous node
+    finishing, or the workflow starting) to it starting, wall_seconds of the
+    run itself, and llm_wait_seconds spent waiting for LLM quota and slots.
+    LLM calls inside the node see its deadline through llm_deadline.
+
+    Args:
+        name: Node name
+        node: Async node function
+
+    Returns:
+        Wrapped node function
+    """
+    async def run(state: AgentState) -> AgentState:
+        started = time.monotonic()
+        started_at = datetime.now(timezone.utc)
+        queue_seconds = started - state.get("runnable_since", started)
+        remaining = state["deadline"] - started
+        timeout = min(_node_timeouts()[name], remaining)
+
+        waits = []
+        token = llm_slot_waits.set(waits)
+        deadline_token = llm_deadline.set(started + timeout)
+        status = "ok"
+        try:
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            state = await asyncio.wait_for(node(state), timeout=timeout)
+            if state.get("error"):
+                status = "error"
+        except asyncio.TimeoutError:
+            status = "timeout"
+            if remaining <= _node_timeouts()[name]:
+                error_msg = f"Session deadline of {settings.SESSION_DEADLINE_SECONDS}s exceeded in {name}"
+            else:
+                error_msg = f"{name.capitalize()} node timed out after {timeout:.0f}s"
+            logger.error(error_msg)
+            state["error"] = error_msg
+            state["current_step"] = f"{name}_failed"
+            await fail_session(state, error_msg)
+        finally:
+            llm_slot_waits.reset(token)
+            llm_deadline.reset(deadline_token)
+
+        finished = time.monotonic()
+        state["runnable_since"] = finished
+        NODE_SECONDS.labels(name, status).observe(finished - started)
+        NODE_QUEUE_SECONDS.labels(name).observe(queue_seconds)
+        await _record_timing(state["session_id"], {
+            "node": name,
+            "status": status,
+            "retry_count": state.get("retry_count", 0),
+            "started_at": started_at,
+            "queue_seconds": round(queue_seconds, 4),
+            "wall_seconds": round(finished - started, 4),
+            "llm_calls": len(waits),
+            "llm_wait_seconds": round(sum(waits), 4),
+        })
+        return state
+
+    return run
+
+
+async def _record_timing(session_id: str, timing: dict):
+    logger.info(
+        f"Node {timing['node']} for session {session_id}: {timing['status']}, "
+        f"wall {timing['wall_seconds']:.2f}s, queued {timing['queue_seconds']:.2f}s, "
+        f"LLM wait {timing['llm_wait_seconds']:.2f}s over {timing['llm_calls']} calls"
+    )
+    try:
+        await ResearchSession.find_one(ResearchSession.session_id == session_id).update(
+            {"$push": {"timings": timing}}
+        )
+    except Exception as e:
+        logger.error(f"Failed to record node timing for session {session_id}: {e}")
+
+
+def _after_node(state: AgentState) -> str:
+    return END if state.get("error") else "next"
+
+
+def _after_editor(state: AgentState) -> str:
+    if state.get("error"):
+        return END
+    return "writer" if state.get("current_step") == "needs_rewrite" else END
+
+
+def build_workflow():
+    """
+    Build the researcher -> writer -> editor graph.
+
+    A failed node ends the run (the node has already marked the session
+    failed); the editor may send the draft back to the writer.
+
+    Returns:
+        Compiled LangGraph workflow
+    """
+    graph = StateGraph(AgentState)
+    graph.add_node("researcher", timed_node("researcher", researcher_node))
+    graph.add_node("writer", timed_node("writer", writer_node))
+    graph.add_node("editor", timed_node("editor", editor_node))
+
+    graph.set_entry_point("researcher")
+    graph.add_conditional_edges("researcher", _after_node, {"next": "writer", END: END})
+    graph.add_conditional_edges("writer", _after_node, {"next": "editor", END: END})
+    graph.add_conditional_edges("editor", _after_editor, {"writer": "writer", END: END})
+
+    return graph.compile()
+
+
+def get_research_workflow():
+    """Get the compiled workflow, building it once"""
+    global research_workflow
+
+    if research_workflow is None:
+        research_workflow = build_workflow()
+    return research_workflow
+
+
+def initial_state(session: ResearchSession, tracker: Optional[SessionProgress] = None) -> AgentState:
+    """Build the starting AgentState for a session"""
+    return {
+        "session_id": session.session_id,
+        "topic": session.topic,
+        "depth": session.depth,
+        "search_results": [],
+        "scraped_content": [],
+        "draft_report": "",
+        "final_report": "",
+        "sources": [],
+        "current_step": "start",
+        "retry_count": 0,
+        "error": None,
+        "completed_nodes": [],
+        "writer_context": None,
+        "rewrite_plan": None,
+        "rewrites": list(session.rewrites),
+        "tracker": tracker or SessionProgress(session.session_id),
+        "deadline": time.monotonic() + settings.SESSION_DEADLINE_SECONDS,
+        "runnable_since": time.monotonic(),
+    }
+
+
+async def run_research_workflow(session_id: str, resume: bool = False) -> Optional[AgentState]:
+    """
+    Run the research workflow for a session.
+
+    Args:
+        session_id: Session to run
+        resume: Continue from the session's last checkpoint instead of starting over
+
+    Returns:
+        The final AgentState, or None if the session does not exist
+    """
+    session = await ResearchSession.find_one(ResearchSession.session_id == session_id)
+    if not session:
+        logger.error(f"Cannot run workflow, session not found: {session_id}")
+        return None
+
+    state = initial_state(session)
+    if resume:
+        state = await restore_checkpoint(state)
+
+    logger.info(f"Running research workflow for session {session_id} (resume={resume})")
+    start = time.monotonic()
+    SESSIONS_IN_FLIGHT.inc()
+    try:
+        # Each editor -> writer loop takes two steps; leave room for every allowed rewrite
+        state = await get_research_workflow().ainvoke(
+            state, {"recursion_limit": 10 + 2 * settings.QUALITY_MAX_REWRITES}
+        )
+    except Exception as e:
+        # Nodes handle their own errors; anything reaching here (graph errors,
+        # recursion limit) would otherwise leave the session and its streams open
+        error_msg = f"Research workflow crashed: {str(e)}"
+        logger.error(error_msg)
+        try:
+            await state["tracker"].fail(error_msg)
+        finally:
+            broker.close(session_id)
+        raise
+    finally:
+        SESSIONS_IN_FLIGHT.dec()
+        await state["tracker"].flush()
+
+    logger.info(
+        f"Research workflow for session {session_id} finished in {time.monotonic() - start:.1f}s: "
+        f"{state.get('current_step')}"
+    )
+    return state
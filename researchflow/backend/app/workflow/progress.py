@@ -0,0 +1,129 @@
+import asyncio
+from typing import Optional
+from app.config import settings
+from app.models.research import ResearchSession
+from app.utils.logger import logger
+from app.utils.pubsub import broker, publish_status
+
+# Statuses that are written through immediately instead of coalesced
+TERMINAL_STATUSES = ("complete", "failed")
+
+
+class SessionProgress:
+    """
+    Progress tracker for one research session, carried through the workflow.
+
+    Every transition is published to the in-process broker straight away, but
+    database writes are coalesced: changed fields accumulate for
+    `coalesce_seconds` and are then written with a single targeted `$set`.
+    The session document is never loaded, and concurrent nodes cannot
+    overwrite each other's fields with a stale full-document save.
+    Terminal transitions are flushed immediately. Sessions attached to this
+    one (see app.workflow.reuse) receive the same fields in the same write.
+    """
+
+    def __init__(self, session_id: str, coalesce_seconds: Optional[float] = None):
+        self.session_id = session_id
+        self.coalesce_seconds = (
+            coalesce_seconds if coalesce_seconds is not None else settings.PROGRESS_COALESCE_SECONDS
+        )
+        self._pending: dict = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def update(
+        self,
+        status: str,
+        progress: Optional[int] = None,
+        current_agent: Optional[str] = None,
+        **fields,
+    ):
+        """
+        Record a status transition.
+
+        Args:
+            status: New session status
+            progress: Progress percentage (0-100)
+            current_agent: Currently active agent
+            **fields: Any other ResearchSession fields to set
+        """
+        publish_status(
+            self.session_id,
+            status,
+            progress,
+            current_agent,
+            report_id=fields.get("report_id"),
+            error_message=fields.get("error_message"),
+        )
+
+        self._pending["status"] = status
+        if progress is not None:
+            self._pending["progress"] = progress
+        if current_agent is not None:
+            self._pending["current_agent"] = current_agent
+        self._pending.update(fields)
+
+        if status in TERMINAL_STATUSES or self.coalesce_seconds <= 0:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def complete(self, report_id: str):
+        """Mark the session complete and end its event stream"""
+        await self.update("complete", 100, "editor", report_id=report_id)
+        broker.publish(self.session_id, "complete", {"report_id": report_id})
+        broker.close(self.session_id)
+
+    async def fail(self, error_msg: str):
+        """Mark the session failed and end its event stream"""
+        await self.update("failed", error_message=error_msg)
+        broker.publish(self.session_id, "failed", {"error": error_msg})
+        broker.close(self.session_id)
+
+    async def flush(self):
+        """Write all pending fields in one atomic update"""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+        async with self._lock:
+            fields, self._pending = self._pending, {}
+            if not fields:
+                return
+            try:
+                await ResearchSession.find(
+                    {"$or": [{"session_id": self.session_id}, {"attached_to": self.session_id}]}
+                ).update({"$set": fields})
+            except Exception as db_error:
+                logger.error(f"Failed to update session status in DB: {db_error}")
+                # Keep the fields for the next flush; anything set since wins
+                self._pending = {**fields, **self._pending}
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.coalesce_seconds)
+        await self.flush()
+
+
+def tracker_for(state: dict) -> SessionProgress:
+    """Get the tracker carried in the workflow state, attaching one if missing"""
+    tracker = state.get("tracker")
+    if tracker is None:
+        tracker = SessionProgress(state["session_id"])
+        state["tracker"] = tracker
+    return tracker
+
+
+async def fail_session(state: dict, error_msg: str):
+    """
+    Mark the session in a workflow state failed, from a node's error handler.
+
+    Never raises, so a state missing its session_id or tracker cannot turn
+    the error being reported into a crash.
+    """
+    try:
+        if state.get("tracker") is None and not state.get("session_id"):
+            logger.error(f"Cannot mark session failed, state has no session_id: {error_msg}")
+            return
+        await tracker_for(state).fail(error_msg)
+    except Exception as e:
+        logger.error(f"Failed to update session status in DB: {e}")
@@ -0,0 +1,195 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from pymongo import ReturnDocument
+from app.config import settings
+from app.models.research import ResearchJob, ResearchSession
+from app.utils.logger import logger
+from app.utils.metrics import JOB_RETRIES
+
+# Wakes local workers as soon as a job is enqueued in this process
+_job_available: Optional[asyncio.Event] = None
+
+
+def _signal() -> asyncio.Event:
+    global _job_available
+
+    if _job_available is None:
+        _job_available = asyncio.Event()
+    return _job_available
+
+
+async def enqueue_job(session_id: str, resume: bool = False) -> str:
+    """
+    Add a workflow run for a session to the durable queue.
+
+    Args:
+        session_id: Session to run the research workflow for
+        resume: Resume from the session's last checkpoint instead of starting over
+
+    Returns:
+        The new job_id
+    """
+    job_id = str(uuid.uuid4())
+    await ResearchJob(job_id=job_id, session_id=session_id, resume=resume).insert()
+    _signal().set()
+    logger.info(f"Enqueued job {job_id} for session {session_id}")
+    return job_id
+
+
+async def wait_for_job(timeout: float):
+    """Sleep until a job is enqueued in this process or the timeout passes"""
+    signal = _signal()
+    try:
+        await asyncio.wait_for(signal.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    signal.clear()
+
+
+async def lease_job(worker_id: str) -> Optional[ResearchJob]:
+    """
+    Atomically lease the oldest runnable job.
+
+    A job is runnable when it is queued, or when it is running but its lease
+    has lapsed because the worker holding it stopped heartbeating.
+
+    Args:
+        worker_id: Identifier of the leasing worker
+
+    Returns:
+        The leased ResearchJob, or None if the queue is empty
+    """
+    now = datetime.now(timezone.utc)
+    document = await ResearchJob.get_motor_collection().find_one_and_update(
+        {
+            "$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lt": now}},
+            ],
+            "attempts": {"$lt": settings.JOB_MAX_ATTEMPTS},
+        },
+        {
+            "$set": {
+                "status": "running",
+                "worker_id": worker_id,
+                "started_at": now,
+                "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("enqueued_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+    if document is None:
+        return None
+
+    job = ResearchJob.model_validate(document)
+    if job.attempts > 1:
+        JOB_RETRIES.inc()
+        logger.warning(f"Reclaimed job {job.job_id} (attempt {job.attempts})")
+    return job
+
+
+async def heartbeat_job(job_id: str, worker_id: str) -> bool:
+    """
+    Extend the lease on a running job.
+
+    Returns:
+        False if the lease was lost to another worker
+    """
+    now = datetime.now(timezone.utc)
+    result = await ResearchJob.get_motor_collection().update_one(
+        {"job_id": job_id, "worker_id": worker_id, "status": "running"},
+        {"$set": {"lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS)}},
+    )
+    return result.matched_count == 1
+
+
+async def finish_job(job_id: str, worker_id: str, error_message: Optional[str] = None):
+    """Mark a leased job done, or failed with an error message"""
+    await ResearchJob.get_motor_collection().update_one(
+        {"job_id": job_id, "worker_id": worker_id},
+        {
+            "$set": {
+                "status": "failed" if error_message else "done",
+                "error_message": error_message,
+                "finished_at": datetime.now(timezone.utc),
+                "lease_expires_at": None,
+            }
+        },
+    )
+
+
+async def fail_exhausted_jobs() -> int:
+    """
+    Fail jobs whose lease lapsed after their last allowed attempt.
+
+    Returns:
+        Number of jobs failed
+    """
+    now = datetime.now(timezone.utc)
+    collection = ResearchJob.get_motor_collection()
+    query = {
+        "status": "running",
+        "lease_expires_at": {"$lt": now},
+        "attempts": {"$gte": settings.JOB_MAX_ATTEMPTS},
+    }
+
+    failed = 0
+    async for document in collection.find(query, {"job_id": 1, "session_id": 1}):
+        error_msg = f"Job abandoned after {settings.JOB_MAX_ATTEMPTS} attempts"
+        result = await collection.update_one(
+            {"job_id": document["job_id"], "status": "running"},
+            {"$set": {"status": "failed", "error_message": error_msg, "finished_at": now}},
+        )
+        if result.modified_count:
+            failed += 1
+            # Sessions attached to this one (app.workflow.reuse) fail with it
+            await ResearchSession.find(
+                {"$or": [{"session_id": document["session_id"]}, {"attached_to": document["session_id"]}]}
+            ).update({"$set": {"status": "failed", "error_message": error_msg}})
+            logger.error(f"Job {document['job_id']} failed: {error_msg}")
+
+    return failed
+
+
+async def queue_stats() -> dict:
+    """
+    Summarize queue depth and wait times.
+
+    Returns:
+        Dictionary with queued and running counts, the age of the oldest queued
+        job, and the mean wait of jobs started in the last 15 minutes
+    """
+    collection = ResearchJob.get_motor_collection()
+    now = datetime.now(timezone.utc)
+
+    queued = await collection.count_documents({"status": "queued"})
+    running = await collection.count_documents({"status": "running"})
+
+    oldest = await collection.find_one(
+        {"status": "queued"}, {"enqueued_at": 1}, sort=[("enqueued_at", 1)]
+    )
+    oldest_wait = (now - _as_utc(oldest["enqueued_at"])).total_seconds() if oldest else 0.0
+
+    waits = []
+    since = now - timedelta(minutes=15)
+    async for document in collection.find(
+        {"started_at": {"$gte": since}}, {"enqueued_at": 1, "started_at": 1}
+    ):
+        waits.append((_as_utc(document["started_at"]) - _as_utc(document["enqueued_at"])).total_seconds())
+
+    return {
+        "queued": queued,
+        "running": running,
+        "oldest_wait_seconds": oldest_wait,
+        "recent_mean_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+        "recent_started": len(waits),
+    }
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo returns naive UTC datetimes unless the client is tz_aware
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -0,0 +1,83 @@
+import asyncio
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.config import settings
+from app.models.research import Report, ResearchSession
+
+# Session statuses of a workflow that is still producing a report
+RUNNING_STATUSES = [
+    "pending",
+    "researcher_running",
+    "researcher_complete",
+    "writer_running",
+    "writer_complete",
+    "editor_running",
+]
+
+# Per-topic creation locks; entries vanish once no request holds them
+_topic_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+async def find_recent_report(topic_key: str, depth: str) -> Optional[Report]:
+    """
+    Find the newest report for a topic and depth within the freshness window.
+
+    Args:
+        topic_key: Normalized topic
+        depth: Research depth
+
+    Returns:
+        The Report, or None if there is no fresh one
+    """
+    since = datetime.now(timezone.utc) - timedelta(seconds=settings.REPORT_REUSE_WINDOW_SECONDS)
+    return await Report.find(
+        Report.topic_key == topic_key,
+        Report.depth == depth,
+        Report.created_at >= since,
+    ).sort(-Report.created_at).first_or_none()
+
+
+async def find_running_session(topic_key: str, depth: str) -> Optional[ResearchSession]:
+    """
+    Find a session already running the workflow for a topic and depth.
+
+    Only sessions that run their own workflow (not attached ones) and that
+    started within REPORT_ATTACH_WINDOW_SECONDS qualify, so a stuck session
+    cannot collect followers forever.
+
+    Args:
+        topic_key: Normalized topic
+        depth: Research depth
+
+    Returns:
+        The leading ResearchSession, or None
+    """
+    since = datetime.now(timezone.utc) - timedelta(seconds=settings.REPORT_ATTACH_WINDOW_SECONDS)
+    return await ResearchSession.find(
+        {
+            "topic_key": topic_key,
+            "depth": depth,
+            "attached_to": None,
+            "status": {"$in": RUNNING_STATUSES},
+            "created_at": {"$gte": since},
+        }
+    ).sort(-ResearchSession.created_at).first_or_none()
+
+
+def topic_lock(topic_key: str, depth: str) -> asyncio.Lock:
+    """
+    Lock serializing session creation for one topic and depth in this process.
+
+    Holding it across the leader lookup and the session insert keeps a burst
+    of identical requests from each starting its own workflow. The lock is
+    per process, so with several API processes deduplication is best-effort:
+    identical requests arriving at different processes at the same moment
+    can still each start a workflow.
+    """
+    key = (topic_key, depth)
+    lock = _topic_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _topic_locks[key] = lock
+    return lock
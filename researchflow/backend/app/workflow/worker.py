@@ -0,0 +1,159 @@
+import asyncio
+import os
+import signal
+import socket
+import uuid
+from typing import List, Optional
+from prometheus_client import start_http_server
+from app.config import settings
+from app.models.research import ResearchJob
+from app.utils.logger import logger
+from app.workflow.graph import run_research_workflow
+from app.workflow.queue import fail_exhausted_jobs, finish_job, heartbeat_job, lease_job, wait_for_job
+
+# Global variables
+worker_pool = None
+
+
+class WorkerPool:
+    """
+    Runs research workflows leased from the durable job queue.
+
+    Each of the `concurrency` slots leases one job at a time, so a process
+    never runs more workflows than it has slots. A running job's lease is
+    renewed by a heartbeat; if the process dies, the lease lapses and
+    another worker reclaims the job.
+    """
+
+    def __init__(self, concurrency: int, worker_id: Optional[str] = None):
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self):
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._slot()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+        logger.info(f"Worker {self.worker_id} started with {self.concurrency} slots")
+
+    async def stop(self):
+        """Stop leasing and cancel running jobs; their leases lapse and are reclaimed"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _slot(self):
+        while not self._stopping:
+            try:
+                job = await lease_job(self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to lease job: {e}")
+                job = None
+
+            if job is None:
+                await wait_for_job(settings.JOB_POLL_INTERVAL)
+                continue
+
+            await self._run(job)
+
+    async def _run(self, job: ResearchJob):
+        logger.info(f"Worker {self.worker_id} running job {job.job_id} for session {job.session_id}")
+        # A reclaimed job resumes after whatever the crashed worker checkpointed
+        workflow = asyncio.create_task(
+            run_research_workflow(job.session_id, resume=job.resume or job.attempts > 1)
+        )
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(job, workflow, lease_lost))
+        error_message = None
+        try:
+            state = await workflow
+            # Nodes report their own failures in the state rather than raising
+            if state is None:
+                error_message = f"Session not found: {job.session_id}"
+            elif state.get("error"):
+                error_message = state["error"]
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+            # Another worker owns the job now; leave finishing it to them
+            logger.warning(f"Stopped job {job.job_id} after losing its lease")
+            return
+        except Exception as e:
+            error_message = f"Workflow crashed: {str(e)}"
+            logger.error(error_message)
+        finally:
+            heartbeat.cancel()
+            workflow.cancel()
+
+        try:
+            await finish_job(job.job_id, self.worker_id, error_message)
+        except Exception as e:
+            logger.error(f"Failed to finish job {job.job_id}: {e}")
+
+    async def _heartbeat(self, job: ResearchJob, workflow: asyncio.Task, lease_lost: asyncio.Event):
+        """Renew the job's lease; cancel the workflow if another worker has taken it over"""
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await heartbeat_job(job.job_id, self.worker_id):
+                    logger.warning(f"Lost lease on job {job.job_id}, cancelling its workflow")
+                    lease_lost.set()
+                    workflow.cancel()
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat failed for job {job.job_id}: {e}")
+
+    async def _reaper(self):
+        while not self._stopping:
+            try:
+                await fail_exhausted_jobs()
+            except Exception as e:
+                logger.error(f"Failed to reap exhausted jobs: {e}")
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS)
+
+
+async def start_worker_pool():
+    """Start the in-process worker pool if embedded workers are enabled"""
+    global worker_pool
+
+    if settings.WORKER_EMBEDDED and worker_pool is None:
+        worker_pool = WorkerPool(settings.WORKER_CONCURRENCY)
+        worker_pool.start()
+
+
+async def stop_worker_pool():
+    """Stop the in-process worker pool"""
+    global worker_pool
+
+    if worker_pool is not None:
+        await worker_pool.stop()
+        worker_pool = None
+
+
+async def main():
+    """Run a standalone worker process: python -m app.workflow.worker"""
+    from app.main import on_startup_resources, on_shutdown_resources
+
+    await on_startup_resources()
+    if settings.WORKER_METRICS_PORT:
+        start_http_server(settings.WORKER_METRICS_PORT)
+        logger.info(f"Serving worker metrics on port {settings.WORKER_METRICS_PORT}")
+    pool = WorkerPool(settings.WORKER_CONCURRENCY)
+    pool.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    await pool.stop()
+    await on_shutdown_resources()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,256 @@
+"""
+End-to-end benchmark of the research API, fully offline.
+
+Starts the stub search, web and LLM servers from benchmarks/stubs.py and the
+real FastAPI app (embedded workers included) with uvicorn in this process,
+pointed at the stubs and at an in-memory Mongo (mongomock://, or --mongo-url
+for a real server). It then drives POST /api/research at the given
+concurrency, follows each session on its status stream, and reports
+throughput, time-to-report percentiles and a per-node breakdown from the
+sessions' recorded timings.
+
+Search runs through the Tavily provider only (DuckDuckGo cannot be
+redirected), and the search, scrape and report caches are off so every
+request does the full work. The LLM response cache is off too unless
+--llm-cache is given: "all" records every response to --llm-cache-path,
+and "replay" serves a later run entirely from that file. Prompts contain the
+stub page URLs, so both runs need the same --html-port.
+
+Needs mongomock-motor for the in-memory database (see benchmarks/requirements.txt).
+
+Usage (from backend/):
+    python -m benchmarks.bench_e2e [--requests 40] [--concurrency 8] [--depth medium]
+        [--llm-tps 400] [--llm-ttft 0.3] [--web-latency 0.1] [--page-kb 60]
+        [--llm-cache off|all|replay] [--html-port 18080] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks.stubs import StubConfig, create_html_app, create_llm_app, create_search_app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server(uvicorn.Server):
+    """uvicorn server that runs as a task and leaves signal handling to us"""
+
+    def install_signal_handlers(self):
+        pass
+
+
+async def start_server(app, port: int) -> asyncio.Task:
+    server = Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    task.server = server
+    return task
+
+
+async def stop_server(task: asyncio.Task):
+    task.server.should_exit = True
+    await task
+
+
+def configure_backend(args, ports: dict):
+    """Point the backend's settings at the stubs; must run before importing app.*"""
+    os.environ.update({
+        "GROQ_API_KEY": "stub",
+        "TAVILY_API_KEY": "stub",
+        "MONGODB_URL": args.mongo_url,
+        "DATABASE_NAME": f"researchflow_bench_{os.getpid()}",
+        "LOG_LEVEL": args.log_level,
+        "LLM_BASE_URL": f"http://127.0.0.1:{ports['llm']}",
+        "TAVILY_API_URL": f"http://127.0.0.1:{ports['search']}/search",
+        "SEARCH_PROVIDERS": '["tavily"]',
+        "SEARCH_CACHE_ENABLED": "false",
+        "SCRAPE_CACHE_ENABLED": "false",
+        "REPORT_REUSE_ENABLED": "false",
+        "LLM_CACHE_MODE": args.llm_cache,
+        "LLM_CACHE_PATH": args.llm_cache_path,
+        "WORKER_EMBEDDED": "true",
+        "WORKER_CONCURRENCY": str(args.workers),
+        "JOB_POLL_INTERVAL": "0.2",
+    })
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def run_session(client: httpx.AsyncClient, topic: str, depth: str) -> dict:
+    start = time.perf_counter()
+    response = await client.post("/api/research", json={"topic": topic, "depth": depth, "reuse": False})
+    response.raise_for_status()
+    session_id = response.json()["session_id"]
+
+    status = None
+    async with client.stream("GET", f"/api/status/{session_id}/stream") as stream:
+        async for line in stream.aiter_lines():
+            if line.startswith("data: "):
+                status = json.loads(line[6:])
+                if status["status"] in ("complete", "failed"):
+                    break
+
+    return {
+        "session_id": session_id,
+        "status": status["status"] if status else "unknown",
+        "seconds": time.perf_counter() - start,
+    }
+
+
+async def drive(base_url: str, requests: int, concurrency: int, depth: str) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            try:
+                return await run_session(client, f"benchmark topic {i}", depth)
+            except Exception as e:
+                return {"session_id": None, "status": f"error: {e}", "seconds": 0.0}
+
+    limits = httpx.Limits(max_connections=concurrency * 2 + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        return await asyncio.gather(*(one(i) for i in range(requests)))
+
+
+async def stage_breakdown(session_ids: list) -> dict:
+    from app.models.research import ResearchSession
+
+    stages = {}
+    async for session in ResearchSession.find({"session_id": {"$in": session_ids}}):
+        for timing in session.timings:
+            stage = stages.setdefault(timing["node"], {"wall": [], "queue": [], "llm_wait": []})
+            stage["wall"].append(timing["wall_seconds"])
+            stage["queue"].append(timing["queue_seconds"])
+            stage["llm_wait"].append(timing["llm_wait_seconds"])
+    return stages
+
+
+def summarize(results: list, elapsed: float, stages: dict) -> dict:
+    completed = [r["seconds"] for r in results if r["status"] == "complete"]
+    return {
+        "requests": len(results),
+        "completed": len(completed),
+        "failed": len(results) - len(completed),
+        "elapsed_seconds": elapsed,
+        "throughput_per_minute": len(completed) / elapsed * 60 if elapsed else 0.0,
+        "time_to_report": {
+            "mean": statistics.fmean(completed) if completed else 0.0,
+            "p50": percentile(completed, 50),
+            "p95": percentile(completed, 95),
+            "p99": percentile(completed, 99),
+        },
+        "stages": {
+            node: {
+                "runs": len(values["wall"]),
+                "wall_p50": percentile(values["wall"], 50),
+                "wall_p95": percentile(values["wall"], 95),
+                "queue_p50": percentile(values["queue"], 50),
+                "llm_wait_p95": percentile(values["llm_wait"], 95),
+            }
+            for node, values in stages.items()
+        },
+    }
+
+
+def print_summary(summary: dict):
+    ttr = summary["time_to_report"]
+    print(f"\n{summary['completed']}/{summary['requests']} reports in {summary['elapsed_seconds']:.1f} s "
+          f"({summary['throughput_per_minute']:.1f}/min), {summary['failed']} failed")
+    print(f"time to report   mean {ttr['mean']:7.2f} s   p50 {ttr['p50']:7.2f} s   "
+          f"p95 {ttr['p95']:7.2f} s   p99 {ttr['p99']:7.2f} s")
+    print(f"\n{'node':<12}{'runs':>6}{'wall p50':>11}{'wall p95':>11}{'queue p50':>11}{'LLM wait p95':>14}")
+    for node in ("researcher", "writer", "editor"):
+        stage = summary["stages"].get(node)
+        if stage:
+            print(f"{node:<12}{stage['runs']:>6}{stage['wall_p50']:>10.2f}s{stage['wall_p95']:>10.2f}s"
+                  f"{stage['queue_p50']:>10.2f}s{stage['llm_wait_p95']:>13.2f}s")
+
+
+async def main(args):
+    ports = {name: free_port() for name in ("search", "html", "llm", "api")}
+    if args.html_port:
+        ports["html"] = args.html_port
+    config = StubConfig(
+        search_latency=args.search_latency,
+        web_latency=args.web_latency,
+        page_kb=args.page_kb,
+        llm_ttft=args.llm_ttft,
+        llm_tokens_per_second=args.llm_tps,
+        llm_report_words=args.report_words,
+        html_base_url=f"http://127.0.0.1:{ports['html']}",
+    )
+
+    configure_backend(args, ports)
+    from app.main import app
+
+    servers = [
+        await start_server(create_search_app(config), ports["search"]),
+        await start_server(create_html_app(config), ports["html"]),
+        await start_server(create_llm_app(config), ports["llm"]),
+    ]
+    api = await start_server(app, ports["api"])
+
+    try:
+        print(f"Driving {args.requests} '{args.depth}' sessions at concurrency {args.concurrency} "
+              f"({args.workers} workflow slots)")
+        start = time.perf_counter()
+        results = await drive(f"http://127.0.0.1:{ports['api']}", args.requests, args.concurrency, args.depth)
+        elapsed = time.perf_counter() - start
+
+        stages = await stage_breakdown([r["session_id"] for r in results if r["session_id"]])
+        summary = summarize(results, elapsed, stages)
+        print_summary(summary)
+
+        errors = sorted({r["status"] for r in results if r["status"] not in ("complete", "failed")})
+        for error in errors:
+            print(f"  {error}")
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"config": vars(args), **summary}, f, indent=2)
+            print(f"\nWrote {args.json}")
+    finally:
+        await stop_server(api)
+        for server in servers:
+            await stop_server(server)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40, help="Research sessions to create")
+    parser.add_argument("--concurrency", type=int, default=8, help="Sessions in flight from the driver")
+    parser.add_argument("--workers", type=int, default=8, help="Embedded workflow slots (WORKER_CONCURRENCY)")
+    parser.add_argument("--depth", default="medium", choices=["quick", "medium", "deep"])
+    parser.add_argument("--search-latency", type=float, default=0.2, help="Stub search latency (s)")
+    parser.add_argument("--web-latency", type=float, default=0.1, help="Stub page latency (s), plus up to 0.1 s jitter")
+    parser.add_argument("--page-kb", type=int, default=60, help="Stub page size (KiB)")
+    parser.add_argument("--llm-ttft", type=float, default=0.3, help="Stub LLM time to first token (s)")
+    parser.add_argument("--llm-tps", type=float, default=400.0, help="Stub LLM tokens per second per call")
+    parser.add_argument("--report-words", type=int, default=900, help="Approximate words in stub drafts")
+    parser.add_argument("--llm-cache", default="off", choices=["off", "all", "replay"], help="LLM_CACHE_MODE")
+    parser.add_argument("--llm-cache-path", default="bench_llm_cache.db", help="LLM cache file for --llm-cache")
+    parser.add_argument("--html-port", type=int, default=0, help="Fixed stub page port (default: any free port)")
+    parser.add_argument("--mongo-url", default="mongomock://localhost", help="MongoDB URL (default: in-memory)")
+    parser.add_argument("--log-level", default="WARNING", help="Backend LOG_LEVEL")
+    parser.add_argument("--json", help="Also write the summary to this JSON file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+"""
+Benchmark the HTML extractor backends on a corpus of saved real-world pages.
+
+Compares throughput and extraction quality of each backend against the
+original scraper (bs4 + html.parser over the whole page). Quality is the
+token-level F1 between the extracted text and the corpus's annotated main
+text, which was written independently of these extractors.
+
+By default the corpus is benchmarks/fixtures/html, a small sample of saved
+documentation pages (see its README for sources, licenses and how the main
+text was annotated). --corpus points at a larger one in either layout:
+
+  * a directory of saved pages, each <name>.html (or .html.gz) next to a
+    <name>.txt holding its main text
+  * the public article-extraction-benchmark dataset
+    (https://github.com/scrapinghub/article-extraction-benchmark):
+    ground-truth.json mapping page ids to {"articleBody": ...}, with the
+    pages in html/<id>.html.gz
+
+Usage (from backend/):
+    python -m benchmarks.bench_extraction [--corpus DIR] [--rounds 20] [--limit 200]
+"""
+import argparse
+import gzip
+import json
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from app.tools.extractors import extract, is_available
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+# (label, backend, main_content)
+CONFIGURATIONS = [
+    ("bs4 full page (current)", "bs4", False),
+    ("bs4 main content", "bs4", True),
+    ("lxml full page", "lxml", False),
+    ("lxml main content", "lxml", True),
+    ("selectolax main content", "selectolax", True),
+]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> Counter:
+    return Counter(_TOKEN_RE.findall(text.lower()))
+
+
+def token_f1(extracted: str, expected: str) -> float:
+    got, want = _tokens(extracted), _tokens(expected)
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(got.values())
+    recall = overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _read_html(path: Path) -> str:
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        data = gzip.decompress(data)
+    return data.decode("utf-8", errors="replace")
+
+
+def load_corpus(corpus: Path, limit: int = 0) -> list:
+    """
+    Load (name, html, expected_text) triples from a corpus directory.
+
+    Raises:
+        FileNotFoundError: If the directory holds neither supported layout
+    """
+    pages = []
+    ground_truth = corpus / "ground-truth.json"
+    if ground_truth.exists():
+        for page_id, annotation in sorted(json.loads(ground_truth.read_text(encoding="utf-8")).items()):
+            html_path = corpus / "html" / f"{page_id}.html.gz"
+            if html_path.exists() and annotation.get("articleBody"):
+                pages.append((page_id, _read_html(html_path), annotation["articleBody"]))
+    else:
+        for html_path in sorted([*corpus.glob("*.html"), *corpus.glob("*.html.gz")]):
+            name = html_path.name.split(".html")[0]
+            text_path = corpus / f"{name}.txt"
+            if text_path.exists():
+                pages.append((name, _read_html(html_path), text_path.read_text(encoding="utf-8")))
+
+    if not pages:
+        raise FileNotFoundError(f"No annotated pages found in {corpus}")
+    return pages[:limit] if limit else pages
+
+
+def run(corpus: Path, rounds: int, limit: int):
+    pages = load_corpus(corpus, limit)
+    total_bytes = sum(len(html.encode("utf-8")) for _, html, _ in pages)
+    print(f"{len(pages)} pages, {total_bytes / (1024 * 1024):.1f} MiB, {rounds} rounds\n")
+    print(f"{'configuration':<26} {'pages/s':>10} {'MiB/s':>8} {'mean F1':>8} {'median F1':>10}")
+
+    for label, backend, main_content in CONFIGURATIONS:
+        if not is_available(backend):
+            print(f"{label:<26} {'(not installed)':>28}")
+            continue
+
+        # Large max_chars so quality is measured on the full extraction
+        scores = [
+            token_f1(extract(html, backend, main_content, max_chars=10**9)[1], expected)
+            for _, html, expected in pages
+        ]
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for _, html, _ in pages:
+                extract(html, backend, main_content, max_chars=10**9)
+        elapsed = time.perf_counter() - start
+
+        pages_per_second = rounds * len(pages) / elapsed
+        mib_per_second = rounds * total_bytes / elapsed / (1024 * 1024)
+        print(f"{label:<26} {pages_per_second:>10.1f} {mib_per_second:>8.2f} "
+              f"{statistics.fmean(scores):>8.3f} {statistics.median(scores):>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=FIXTURES_DIR, help="Corpus directory (default: the saved fixtures)")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed passes over the corpus")
+    parser.add_argument("--limit", type=int, default=0, help="Use only the first N pages (default: all)")
+    args = parser.parse_args()
+    try:
+        run(args.corpus, args.rounds, args.limit)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
@@ -0,0 +1,143 @@
+"""
+Benchmark session and report lookups against a large collection.
+
+Seeds a scratch database with N sessions and N reports, then times the
+lookups the API performs (session by session_id, report by report_id,
+report by session_id, recent sessions by status) first without indexes
+and then with the indexes declared on the Beanie models.
+
+Needs a real MongoDB server; the scratch database is dropped afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_mongo_lookup [--docs 1000000] [--lookups 200]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
+
+from app.config import settings
+
+BATCH_SIZE = 10000
+STATUSES = ["complete"] * 8 + ["failed", "pending"]
+
+
+async def seed(db, docs: int):
+    sessions, reports = db["research_sessions"], db["reports"]
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    session_ids, report_ids = [], []
+
+    for offset in range(0, docs, BATCH_SIZE):
+        session_batch, report_batch = [], []
+        for i in range(offset, min(offset + BATCH_SIZE, docs)):
+            session_id, report_id = str(uuid.uuid4()), str(uuid.uuid4())
+            created_at = start + timedelta(seconds=i * 30)
+            session_batch.append({
+                "session_id": session_id,
+                "topic": f"Benchmark topic {i}",
+                "depth": "medium",
+                "status": random.choice(STATUSES),
+                "progress": 100,
+                "report_id": report_id,
+                "created_at": created_at,
+            })
+            report_batch.append({
+                "report_id": report_id,
+                "session_id": session_id,
+                "topic": f"Benchmark topic {i}",
+                "content": "x" * 200,
+                "sources": [],
+                "word_count": 1,
+                "created_at": created_at,
+            })
+            if i % 1000 == 0:
+                session_ids.append(session_id)
+                report_ids.append(report_id)
+
+        await sessions.insert_many(session_batch, ordered=False)
+        await reports.insert_many(report_batch, ordered=False)
+        print(f"\rseeded {min(offset + BATCH_SIZE, docs):,} / {docs:,}", end="", flush=True)
+
+    print()
+    return session_ids, report_ids
+
+
+async def create_indexes(db):
+    """Mirror the indexes Beanie builds from app/models/research.py"""
+    await db["research_sessions"].create_index("session_id", unique=True)
+    await db["research_sessions"].create_index(
+        [("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"
+    )
+    await db["reports"].create_index("report_id", unique=True)
+    await db["reports"].create_index("session_id")
+
+
+async def time_lookups(label: str, lookups: int, query):
+    latencies = []
+    for _ in range(lookups):
+        start = time.perf_counter()
+        await query()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<34} p50 {statistics.median(latencies):9.2f} ms   p95 {p95:9.2f} ms")
+
+
+async def run_suite(db, session_ids, report_ids, lookups: int):
+    sessions, reports = db["research_sessions"], db["reports"]
+
+    await time_lookups(
+        "session by session_id", lookups,
+        lambda: sessions.find_one({"session_id": random.choice(session_ids)}),
+    )
+    await time_lookups(
+        "report by report_id", lookups,
+        lambda: reports.find_one({"report_id": random.choice(report_ids)}),
+    )
+    await time_lookups(
+        "report by session_id", lookups,
+        lambda: reports.find_one({"session_id": random.choice(session_ids)}),
+    )
+    await time_lookups(
+        "20 newest pending sessions", lookups,
+        lambda: sessions.find({"status": "pending"}).sort("created_at", DESCENDING).limit(20).to_list(20),
+    )
+
+
+async def main(docs: int, lookups: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[f"{settings.DATABASE_NAME}_bench_{uuid.uuid4().hex[:8]}"]
+
+    try:
+        print(f"Seeding {docs:,} sessions and reports into {db.name}")
+        session_ids, report_ids = await seed(db, docs)
+
+        # Collection scans are slow at this size; keep the unindexed pass short
+        print("\nWithout indexes")
+        await run_suite(db, session_ids, report_ids, max(lookups // 10, 5))
+
+        print("\nBuilding indexes")
+        start = time.perf_counter()
+        await create_indexes(db)
+        print(f"  built in {time.perf_counter() - start:.1f} s")
+
+        print("\nWith indexes")
+        await run_suite(db, session_ids, report_ids, lookups)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1_000_000, help="Sessions (and reports) to seed")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per query in the indexed pass")
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.lookups))
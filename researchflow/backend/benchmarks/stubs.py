@@ -0,0 +1,194 @@
+"""
+Local stand-ins for the services the backend calls, for offline benchmarks.
+
+    search_app  Tavily-compatible POST /search returning links to html_app
+    html_app    GET /page/{n}: generated article pages of a configurable size
+    llm_app     Groq/OpenAI-compatible POST /openai/v1/chat/completions that
+                generates plausible report markdown at a configurable token rate
+
+The apps read latency, size and rate settings from a shared StubConfig.
+"""
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+
+_URL_RE = re.compile(r"https?://[^\s)\]>\"'`]+")
+
+WORDS = (
+    "battery grid storage lithium recycling cathode yield market policy research analysis "
+    "efficiency deployment capacity emissions supply chain cost performance adoption data "
+    "study results growth network model system evidence trend sector investment risk"
+).split()
+
+
+@dataclass
+class StubConfig:
+    search_latency: float = 0.2
+    search_results: int = 10
+    web_latency: float = 0.1
+    web_jitter: float = 0.1
+    page_kb: int = 60
+    llm_ttft: float = 0.3
+    llm_tokens_per_second: float = 400.0
+    llm_report_words: int = 900
+    html_base_url: str = ""
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    # Sample without replacement so no word repeats back to back
+    text = " ".join(rng.sample(WORDS, words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+
+def create_search_app(config: StubConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/search")
+    async def search(request: Request):
+        body = await request.json()
+        await asyncio.sleep(config.search_latency)
+        rng = random.Random(body.get("query", ""))
+        count = min(int(body.get("max_results", config.search_results)), config.search_results)
+        return {
+            "results": [
+                {
+                    "url": f"{config.html_base_url}/page/{rng.randrange(1_000_000)}",
+                    "title": f"Result {i} for {body.get('query', '')}",
+                    "content": _paragraph(rng, 2),
+                }
+                for i in range(count)
+            ]
+        }
+
+    return app
+
+
+def create_html_app(config: StubConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/page/{page_id}")
+    async def page(page_id: int):
+        await asyncio.sleep(config.web_latency + random.random() * config.web_jitter)
+        rng = random.Random(page_id)
+
+        nav = "".join(f'<li><a href="/page/{rng.randrange(1000)}">{rng.choice(WORDS)}</a></li>' for _ in range(30))
+        paragraphs = []
+        size = 0
+        while size < config.page_kb * 1024:
+            paragraph = f"<p>{_paragraph(rng)}</p>"
+            paragraphs.append(paragraph)
+            size += len(paragraph) + len(nav) // 10
+
+        html = f"""<!doctype html><html><head><title>Article {page_id}</title>
+<script>var tracking = {{"id": {page_id}}};</script><style>body {{ margin: 0 }}</style></head>
+<body><nav><ul>{nav}</ul></nav><main><article><h1>Article {page_id}</h1>{''.join(paragraphs)}</article></main>
+<footer><ul>{nav}</ul></footer></body></html>"""
+        return HTMLResponse(html)
+
+    return app
+
+
+def _generate(prompt: str, max_tokens: int, config: StubConfig) -> str:
+    """Produce a response shaped like what each backend prompt expects"""
+    rng = random.Random(prompt[:200])
+    urls = list(dict.fromkeys(_URL_RE.findall(prompt)))[:8]
+
+    def cited_paragraph() -> str:
+        citation = f" (see {rng.choice(urls)})" if urls else ""
+        return _paragraph(rng, 4)[:-1] + citation + "."
+
+    if "Summarize the following source" in prompt:
+        text = " ".join(_sentence(rng) for _ in range(8))
+    elif "Write ONLY these sections" in prompt:
+        titles = prompt.split("Write ONLY these sections, in this order, each starting with a \"## \" heading: ")[1]
+        titles = titles.split(".\n")[0].split(", ")
+        text = "\n\n".join(f"## {title}\n\n" + "\n\n".join(cited_paragraph() for _ in range(4)) for title in titles)
+    elif "You are editing one section" in prompt:
+        text = prompt.split("Do not add new sections.", 1)[1].split("\n\n", 1)[1]
+    else:
+        topic = re.search(r"report on '([^']*)'", prompt)
+        # ~56 words per paragraph over three prose sections
+        per_section = max(config.llm_report_words // 56 // 3, 1)
+        text = "\n\n".join([
+            f"# {topic.group(1) if topic else 'Report'}",
+            "## Introduction", "\n\n".join(cited_paragraph() for _ in range(per_section)),
+            "## Key Findings", "\n".join(f"- {_sentence(rng, 12)}" for _ in range(6)),
+            "## Detailed Analysis", "\n\n".join(cited_paragraph() for _ in range(per_section)),
+            "## Conclusion", "\n\n".join(cited_paragraph() for _ in range(max(per_section // 2, 1))),
+        ])
+
+    # About four characters per token
+    return text[:max_tokens * 4]
+
+
+def create_llm_app(config: StubConfig) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        text = _generate(prompt, int(body.get("max_tokens") or 2000), config)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(text) // 4,
+            "total_tokens": (len(prompt) + len(text)) // 4,
+        }
+
+        if not body.get("stream"):
+            await asyncio.sleep(config.llm_ttft + len(text) / 4 / config.llm_tokens_per_second)
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+        async def stream():
+            await asyncio.sleep(config.llm_ttft)
+            # Emit ~20-token chunks at the configured rate
+            step = 80
+            for start in range(0, len(text), step):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": text[start:start + step]}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(step / 4 / config.llm_tokens_per_second)
+
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": body["model"],
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "x_groq": {"id": completion_id, "usage": usage},
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
@@ -0,0 +1,7 @@
+import os
+
+# Settings requires these; tests never reach the real services
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
+os.environ.setdefault("MONGODB_URL", "mongomock://localhost")
+os.environ.setdefault("LLM_CACHE_MODE", "off")
@@ -0,0 +1,56 @@
+import asyncio
+
+from app.workflow import graph
+from app.utils.pubsub import broker
+
+
+class FakeTracker:
+    def __init__(self):
+        self.failed = None
+        self.flushed = False
+
+    async def fail(self, error_msg):
+        self.failed = error_msg
+
+    async def flush(self):
+        self.flushed = True
+
+
+class FakeSession:
+    """Stands in for the ResearchSession model; Beanie is not initialised here"""
+    session_id = "session-crash"
+
+    @classmethod
+    async def find_one(cls, *args, **kwargs):
+        return cls()
+
+
+class CrashingWorkflow:
+    async def ainvoke(self, state, config):
+        raise RuntimeError("Recursion limit reached")
+
+
+def test_crashed_workflow_fails_session_and_closes_streams(monkeypatch):
+    tracker = FakeTracker()
+
+    monkeypatch.setattr(graph, "ResearchSession", FakeSession)
+    monkeypatch.setattr(graph, "initial_state", lambda session: {"session_id": session.session_id, "tracker": tracker})
+    monkeypatch.setattr(graph, "get_research_workflow", lambda: CrashingWorkflow())
+
+    async def run():
+        queue = broker.subscribe("session-crash")
+        try:
+            await graph.run_research_workflow("session-crash")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("the crash should propagate to the worker")
+        # The subscriber's stream ends instead of waiting forever
+        while True:
+            item = await asyncio.wait_for(queue.get(), timeout=1)
+            if item is None:
+                return
+
+    asyncio.run(run())
+    assert tracker.failed == "Research workflow crashed: Recursion limit reached"
+    assert tracker.flushed
@@ -0,0 +1,28 @@
+import pytest
+
+from app.utils.helpers import normalize_query, normalize_url
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Battery  Recycling", "battery recycling"),
+    ("What is Rust?", "what is rust"),
+    ("  lithium supply chain...  ", "Lithium supply chain"),
+])
+def test_normalize_query_folds_case_whitespace_and_trailing_punctuation(a, b):
+    assert normalize_query(a) == normalize_query(b)
+
+
+def test_normalize_query_keeps_punctuation_inside_tokens():
+    keys = {normalize_query(topic) for topic in ("C++ concurrency", "C# concurrency", "C concurrency")}
+    assert len(keys) == 3
+    assert normalize_query("Node.js streams") == "node.js streams"
+    assert normalize_query("Learn C++.") == "learn c++"
+
+
+def test_normalize_url_drops_tracking_params_only():
+    assert normalize_url("HTTPS://Example.com:443/a/?utm_source=x&b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("https://example.com/?fbclid=abc") == "https://example.com/"
+
+
+def test_normalize_url_keeps_content_changing_ref():
+    assert normalize_url("https://github.com/x/y?ref=main") != normalize_url("https://github.com/x/y")
@@ -0,0 +1,82 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.config import settings
+from app.tools import llm
+from app.tools.llm_cache import LLMCache
+
+
+class LockedCache(LLMCache):
+    """LLMCache whose database is locked by another process"""
+
+    async def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    async def put(self, key, model, response):
+        raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    calls = []
+
+    async def call(prompt, model, on_token, temperature, max_tokens):
+        calls.append(prompt)
+        return f"answer to {prompt}"
+
+    monkeypatch.setattr(llm, "_call_llm", call)
+    return calls
+
+
+def test_cache_round_trip(tmp_path, monkeypatch, api_calls):
+    cache = LLMCache(str(tmp_path / "llm_cache.db"), ttl=60, max_bytes=10_000)
+    monkeypatch.setattr(llm, "get_llm_cache", lambda: cache)
+    try:
+        first = asyncio.run(llm.call_llm("What  is\tWAL?", temperature=0, cache=True))
+        second = asyncio.run(llm.call_llm("What is WAL?", temperature=0, cache=True))
+    finally:
+        cache.close()
+
+    assert first == second
+    assert len(api_calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_sampled_calls_are_not_cached(tmp_path, monkeypatch, api_calls):
+    cache = LLMCache(str(tmp_path / "llm_cache.db"), ttl=60, max_bytes=10_000)
+    monkeypatch.setattr(llm, "get_llm_cache", lambda: cache)
+    try:
+        for _ in range(2):
+            asyncio.run(llm.call_llm("Write a report", temperature=0.7, cache=True))
+    finally:
+        cache.close()
+
+    assert len(api_calls) == 2
+    assert cache.stats()["hits"] + cache.stats()["misses"] == 0
+
+
+def test_locked_cache_falls_back_to_the_api(tmp_path, monkeypatch, api_calls):
+    cache = LockedCache(str(tmp_path / "llm_cache.db"), ttl=60, max_bytes=10_000)
+    monkeypatch.setattr(llm, "get_llm_cache", lambda: cache)
+    try:
+        response = asyncio.run(llm.call_llm("prompt", temperature=0, cache=True))
+    finally:
+        cache.close()
+
+    assert response == "answer to prompt"
+    assert api_calls == ["prompt"]
+
+
+def test_locked_cache_in_replay_mode_is_a_miss(tmp_path, monkeypatch, api_calls):
+    cache = LockedCache(str(tmp_path / "llm_cache.db"), ttl=60, max_bytes=10_000, ignore_ttl=True)
+    monkeypatch.setattr(llm, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(settings, "LLM_CACHE_MODE", "replay")
+    try:
+        with pytest.raises(llm.LLMError):
+            asyncio.run(llm.call_llm("prompt"))
+    finally:
+        cache.close()
+
+    assert api_calls == []
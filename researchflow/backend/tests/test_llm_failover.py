@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from groq import BadRequestError, InternalServerError, RateLimitError
+
+from app.config import settings
+from app.tools import llm
+
+PRIMARY = "primary-model"
+FALLBACK = "fallback-model"
+
+
+def api_error(error_class, status: int, headers: dict = None):
+    request = httpx.Request("POST", "http://llm.test/openai/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return error_class(f"Error code: {status}", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_state(monkeypatch):
+    monkeypatch.setattr(llm, "breakers", {})
+    monkeypatch.setattr(llm, "rate_limits", {})
+    monkeypatch.setattr(settings, "LLM_FALLBACK_MODELS", [])
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 3)
+    monkeypatch.setattr(settings, "LLM_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(settings, "LLM_BACKOFF_MAX", 0.2)
+    monkeypatch.setattr(settings, "LLM_FALLBACK_AFTER_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 5)
+    monkeypatch.setattr(settings, "LLM_HEDGE_DELAY", None)
+
+
+def scripted_complete(monkeypatch, script):
+    """Replace _complete; script(model, call_number) returns text or raises"""
+    calls = []
+
+    async def complete(prompt, model, temperature, max_tokens, sent):
+        calls.append(model)
+        return script(model, len(calls))
+
+    monkeypatch.setattr(llm, "_complete", complete)
+    return calls
+
+
+def test_burst_of_rate_limits_does_not_fail_concurrent_calls(monkeypatch):
+    rate_limited = {"count": 0}
+
+    def script(model, call):
+        # The first eight requests of the burst are all rejected
+        if rate_limited["count"] < 8:
+            rate_limited["count"] += 1
+            raise api_error(RateLimitError, 429, {"retry-after": "0.05"})
+        return "ok"
+
+    calls = scripted_complete(monkeypatch, script)
+
+    async def run():
+        return await asyncio.gather(*(llm.call_llm("prompt", model=PRIMARY) for _ in range(8)))
+
+    assert asyncio.run(run()) == ["ok"] * 8
+    assert len(calls) == 16
+    assert llm.breakers[PRIMARY].state == "closed"
+
+
+def test_retry_after_without_fallback_is_waited_out_in_full(monkeypatch):
+    def script(model, call):
+        if call == 1:
+            # Longer than LLM_BACKOFF_MAX, which must not cut it short
+            raise api_error(RateLimitError, 429, {"retry-after": "0.5"})
+        return "ok"
+
+    calls = scripted_complete(monkeypatch, script)
+    started = time.monotonic()
+    assert asyncio.run(llm.call_llm("prompt", model=PRIMARY)) == "ok"
+    assert time.monotonic() - started >= 0.5
+    assert calls == [PRIMARY, PRIMARY]
+
+
+def test_retry_after_past_the_deadline_fails_fast(monkeypatch):
+    def script(model, call):
+        raise api_error(RateLimitError, 429, {"retry-after": "60"})
+
+    calls = scripted_complete(monkeypatch, script)
+
+    async def run():
+        llm.llm_deadline.set(time.monotonic() + 5)
+        return await llm.call_llm("prompt", model=PRIMARY)
+
+    started = time.monotonic()
+    with pytest.raises(llm.LLMError, match="past the deadline"):
+        asyncio.run(run())
+    assert time.monotonic() - started < 1
+    assert calls == [PRIMARY]
+
+
+def test_long_retry_after_moves_to_fallback_model(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_FALLBACK_MODELS", [FALLBACK])
+
+    def script(model, call):
+        if model == PRIMARY:
+            raise api_error(RateLimitError, 429, {"retry-after": "30"})
+        return "fallback ok"
+
+    calls = scripted_complete(monkeypatch, script)
+    assert asyncio.run(llm.call_llm("prompt", model=PRIMARY)) == "fallback ok"
+    assert calls == [PRIMARY, FALLBACK]
+
+    # Later calls skip the model while it is blocked
+    calls.clear()
+    assert asyncio.run(llm.call_llm("prompt", model=PRIMARY)) == "fallback ok"
+    assert calls == [FALLBACK]
+
+
+def test_server_errors_open_the_breaker_and_fall_back(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_FALLBACK_MODELS", [FALLBACK])
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURES", 2)
+
+    def script(model, call):
+        if model == PRIMARY:
+            raise api_error(InternalServerError, 503)
+        return "fallback ok"
+
+    calls = scripted_complete(monkeypatch, script)
+    assert asyncio.run(llm.call_llm("prompt", model=PRIMARY)) == "fallback ok"
+    assert calls == [PRIMARY, PRIMARY, FALLBACK]
+    assert llm.breakers[PRIMARY].state == "open"
+
+
+def test_retries_exhausted_raise_llm_error(monkeypatch):
+    def script(model, call):
+        raise api_error(InternalServerError, 500)
+
+    calls = scripted_complete(monkeypatch, script)
+    with pytest.raises(llm.LLMError):
+        asyncio.run(llm.call_llm("prompt", model=PRIMARY))
+    assert len(calls) == settings.LLM_MAX_RETRIES + 1
+
+
+def test_bad_request_is_not_retried(monkeypatch):
+    def script(model, call):
+        raise api_error(BadRequestError, 400)
+
+    calls = scripted_complete(monkeypatch, script)
+    with pytest.raises(llm.LLMError):
+        asyncio.run(llm.call_llm("prompt", model=PRIMARY))
+    assert calls == [PRIMARY]
+    assert llm.breakers[PRIMARY].failures == 0
@@ -0,0 +1,39 @@
+import asyncio
+
+from app.workflow import progress
+from app.workflow.progress import SessionProgress, fail_session
+
+
+class FlakySessions:
+    """Stands in for the ResearchSession model; the first write fails"""
+    writes = []
+    fail_next = True
+
+    @classmethod
+    def find(cls, query):
+        return cls()
+
+    async def update(self, change):
+        if FlakySessions.fail_next:
+            FlakySessions.fail_next = False
+            raise ConnectionError("database unavailable")
+        FlakySessions.writes.append(change["$set"])
+
+
+def test_failed_flush_keeps_fields_for_the_next_one(monkeypatch):
+    monkeypatch.setattr(progress, "ResearchSession", FlakySessions)
+    FlakySessions.writes, FlakySessions.fail_next = [], True
+
+    async def run():
+        tracker = SessionProgress("s", coalesce_seconds=0)
+        await tracker.update("writer_running", 40, "writer", sources=["a"])
+        await tracker.update("writer_complete", 66)
+
+    asyncio.run(run())
+    assert FlakySessions.writes == [
+        {"status": "writer_complete", "progress": 66, "current_agent": "writer", "sources": ["a"]},
+    ]
+
+
+def test_fail_session_without_session_id_does_not_raise():
+    asyncio.run(fail_session({}, "Researcher node failed: boom"))
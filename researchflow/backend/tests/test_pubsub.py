@@ -0,0 +1,50 @@
+import asyncio
+
+from app.utils.pubsub import SessionBroker
+
+
+def drain(queue: asyncio.Queue) -> list:
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+
+def test_late_subscriber_keeps_status_events_behind_many_deltas():
+    async def run():
+        broker = SessionBroker(queue_size=100)
+        broker.publish("s", "status", {"status": "pending"})
+        broker.publish("s", "draft_start", {"retry_count": 0})
+        for i in range(1000):
+            broker.publish("s", "draft", {"text": f"{i} "})
+        broker.publish("s", "status", {"status": "writer_complete"})
+        return drain(broker.subscribe("s"))
+
+    messages = asyncio.run(run())
+    assert [m["event"] for m in messages] == ["status", "draft_start", "draft", "status"]
+    assert messages[0]["data"] == {"status": "pending"}
+    assert messages[2]["data"]["text"] == "".join(f"{i} " for i in range(1000))
+
+
+def test_live_subscribers_still_get_every_delta():
+    async def run():
+        broker = SessionBroker()
+        queue = broker.subscribe("s")
+        for text in ("a", "b", "c"):
+            broker.publish("s", "draft", {"text": text})
+        return drain(queue)
+
+    assert [m["data"]["text"] for m in asyncio.run(run())] == ["a", "b", "c"]
+
+
+def test_separate_text_runs_are_not_merged():
+    async def run():
+        broker = SessionBroker()
+        broker.publish("s", "draft", {"text": "first"})
+        broker.publish("s", "draft_start", {"retry_count": 1})
+        broker.publish("s", "draft", {"text": "second"})
+        return drain(broker.subscribe("s"))
+
+    assert [(m["event"], m["data"].get("text")) for m in asyncio.run(run())] == [
+        ("draft", "first"), ("draft_start", None), ("draft", "second"),
+    ]
@@ -0,0 +1,43 @@
+from app.agents.quality import find_section, section_issues
+from app.utils.markdown import split_sections
+
+
+def issues_by_title(markdown: str, max_level: int = 2) -> dict:
+    sections = split_sections(markdown, max_level=max_level)
+    return {
+        section["title"]: section_issues(section, sections[idx + 1] if idx + 1 < len(sections) else None)
+        for idx, section in enumerate(sections)
+    }
+
+
+def test_report_title_without_text_is_not_flagged():
+    issues = issues_by_title("# Battery Recycling\n\n## Introduction\n\nRecycling recovers lithium.")
+    assert issues == {"Battery Recycling": [], "Introduction": []}
+
+
+def test_heading_followed_by_subsection_is_not_flagged():
+    issues = issues_by_title("## Analysis\n\n### Costs\n\nCosts fell sharply.", max_level=3)
+    assert issues == {"Analysis": [], "Costs": []}
+
+
+def test_empty_section_is_flagged():
+    issues = issues_by_title("## Introduction\n\n## Conclusion\n\nDone.")
+    assert issues["Introduction"] == ["the section has a heading but no text"]
+
+
+def test_unfinished_last_sentence_is_flagged():
+    issues = issues_by_title("## Conclusion\n\nThe market is growing because")
+    assert issues["Conclusion"] == ["the last sentence is unfinished"]
+
+
+def test_find_section_skips_a_report_title_containing_the_name():
+    sections = split_sections("# Introduction to Rust\n\nOverview.\n\n## 1. Introduction\n\nRust is a systems language.")
+    section = find_section(sections, "Introduction")
+    assert section["level"] == 2
+    assert section["body"].strip() == "Rust is a systems language."
+
+
+def test_find_section_requires_the_whole_title():
+    sections = split_sections("# Rust\n\n## Introduction to ownership\n\nBorrowing rules.\n\n## **Key Findings:**\n\n- Fast")
+    assert find_section(sections, "Introduction") is None
+    assert find_section(sections, "Key Findings")["title"] == "**Key Findings:**"
@@ -0,0 +1,35 @@
+import asyncio
+
+from app.api import research
+from app.config import settings
+from app.utils.pubsub import broker
+
+
+class FakeSession:
+    """Stands in for the ResearchSession model; Beanie is not initialised here"""
+    session_id = "session-elsewhere"
+    statuses = []
+
+    def __init__(self, status):
+        self.status = status
+        self.error_message = "Search failed"
+
+    @classmethod
+    async def find_one(cls, *args, **kwargs):
+        return cls(cls.statuses.pop(0))
+
+
+def test_report_stream_ends_when_a_session_in_another_process_finishes(monkeypatch):
+    monkeypatch.setattr(research, "ResearchSession", FakeSession)
+    monkeypatch.setattr(FakeSession, "statuses", ["writer_running", "failed"])
+    monkeypatch.setattr(settings, "STATUS_STREAM_FALLBACK_SECONDS", 0.01)
+
+    async def collect():
+        queue = broker.subscribe("session-elsewhere")
+        return [event async for event in research._report_events(queue, "session-elsewhere")]
+
+    events = asyncio.run(asyncio.wait_for(collect(), timeout=2))
+
+    assert events[0] == ": keepalive\n\n"
+    assert events[-1].startswith("event: failed")
+    assert "Search failed" in events[-1]
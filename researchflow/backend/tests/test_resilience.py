@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.resilience import CircuitBreaker, TokenBucket, backoff_delay, parse_duration, parse_retry_after
+
+
+def test_token_bucket_grants_up_to_capacity_then_waits():
+    async def run():
+        bucket = TokenBucket(600, capacity=2)  # 10 tokens a second
+        assert await bucket.acquire() == 0
+        assert await bucket.acquire() == 0
+        waited = await bucket.acquire()
+        assert 0.05 < waited < 0.3
+
+    asyncio.run(run())
+
+
+def test_token_bucket_caps_requests_larger_than_capacity():
+    async def run():
+        bucket = TokenBucket(6000, capacity=10)
+        assert await bucket.acquire(50) == 0
+        assert bucket.tokens == pytest.approx(0, abs=0.5)
+
+    asyncio.run(run())
+
+
+def test_token_bucket_block_for_holds_back_callers():
+    async def run():
+        bucket = TokenBucket(60000)
+        bucket.block_for(0.2)
+        assert bucket.blocked_for() > 0.1
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.18
+        assert bucket.blocked_for() == 0
+
+    asyncio.run(run())
+
+
+def test_token_bucket_limit_to_and_refund():
+    bucket = TokenBucket(60, capacity=100)
+    bucket.limit_to(10)
+    assert bucket.tokens == pytest.approx(10, abs=0.1)
+    bucket.limit_to(50)  # never raises the level
+    assert bucket.tokens == pytest.approx(10, abs=0.1)
+    bucket.refund(1000)
+    assert bucket.tokens == 100
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_circuit_breaker_half_open_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow() and breaker.allow()
+
+
+def test_circuit_breaker_gives_up_on_a_trial_that_never_reports():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("7.66s", 7.66),
+    ("2m59.56s", 179.56),
+    ("120ms", 0.12),
+    ("1h2m3s", 3723.0),
+    ("12", 12.0),
+    (None, None),
+    ("", None),
+    ("soon", None),
+])
+def test_parse_duration(value, expected):
+    result = parse_duration(value)
+    if expected is None:
+        assert result is None
+    else:
+        assert result == pytest.approx(expected)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, base=0.5, cap=4.0) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(backoff_delay(0, base=0.5, cap=4.0) <= 0.5 for _ in range(50))
+
+
+def test_backoff_delay_honours_retry_after_as_floor():
+    assert all(backoff_delay(0, base=0.5, cap=4.0, retry_after=3.0) >= 3.0 for _ in range(50))
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.tools import scraper
+
+
+def test_cancelling_scrape_urls_cancels_inflight_scrapes(monkeypatch):
+    started = []
+    cancelled = []
+
+    async def slow_scrape(url):
+        started.append(url)
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+
+    monkeypatch.setattr(scraper, "scrape_url", slow_scrape)
+    urls = ["https://a.example/1", "https://b.example/2"]
+
+    async def run():
+        caller = asyncio.create_task(scraper.scrape_urls(urls, timeout=60))
+        while len(started) < len(urls):
+            await asyncio.sleep(0)
+        caller.cancel()
+        try:
+            await caller
+        except asyncio.CancelledError:
+            pass
+        # Checked before asyncio.run() would cancel leftover tasks itself
+        return sorted(cancelled)
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=2)) == urls
+
+
+def test_scrape_deadline_falls_back_to_snippets(monkeypatch):
+    async def scrape(url):
+        if "slow" in url:
+            await asyncio.sleep(60)
+        return {"url": url, "success": True}
+
+    monkeypatch.setattr(scraper, "scrape_url", scrape)
+    urls = ["https://fast.example/", "https://slow.example/"]
+    results = asyncio.run(scraper.scrape_urls(urls, snippets={urls[1]: {"snippet": "cached"}}, timeout=0.1))
+
+    assert results[0] == {"url": urls[0], "success": True}
+    assert results[1]["content"] == "cached"
+    assert results[1]["from_snippet"]
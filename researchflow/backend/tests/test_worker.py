@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.models.research import ResearchJob
+from app.workflow import worker
+from app.workflow.worker import WorkerPool
+
+
+@pytest.fixture
+def finished(monkeypatch):
+    """Record finish_job calls instead of writing to Mongo"""
+    calls = []
+
+    async def finish_job(job_id, worker_id, error_message=None):
+        calls.append((job_id, error_message))
+
+    monkeypatch.setattr(worker, "finish_job", finish_job)
+    return calls
+
+
+def make_job() -> ResearchJob:
+    # model_construct() skips Beanie's collection check; the model is not initialised here
+    return ResearchJob.model_construct(job_id="job-1", session_id="session-1", resume=False, attempts=1)
+
+
+def test_failed_session_fails_the_job(monkeypatch, finished):
+    async def run_research_workflow(session_id, resume=False):
+        return {"session_id": session_id, "error": "Writer node failed: boom"}
+
+    monkeypatch.setattr(worker, "run_research_workflow", run_research_workflow)
+    asyncio.run(WorkerPool(1, "w")._run(make_job()))
+    assert finished == [("job-1", "Writer node failed: boom")]
+
+
+def test_successful_session_finishes_the_job(monkeypatch, finished):
+    async def run_research_workflow(session_id, resume=False):
+        return {"session_id": session_id, "error": None}
+
+    monkeypatch.setattr(worker, "run_research_workflow", run_research_workflow)
+    asyncio.run(WorkerPool(1, "w")._run(make_job()))
+    assert finished == [("job-1", None)]
+
+
+def test_lost_lease_cancels_the_workflow(monkeypatch, finished):
+    cancelled = []
+
+    async def run_research_workflow(session_id, resume=False):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(session_id)
+            raise
+
+    async def heartbeat_job(job_id, worker_id):
+        return False
+
+    monkeypatch.setattr(worker, "run_research_workflow", run_research_workflow)
+    monkeypatch.setattr(worker, "heartbeat_job", heartbeat_job)
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.01)
+
+    asyncio.run(asyncio.wait_for(WorkerPool(1, "w")._run(make_job()), timeout=2))
+    assert cancelled == ["session-1"]
+    assert finished == []